@@ -5,6 +5,9 @@
  */
 
 #pragma once
+#include <algorithm>
+#include <cmath>
+#include <cstdint>
 #include <fstream>
 #include <filesystem>
 #include <vector>
@@ -26,6 +29,7 @@ class SceneLoader {
 public:
     static constexpr uint32_t MAGIC = 0x53474341;  // 'ACGS' in little-endian
     static constexpr uint32_t VERSION = 1;
+    static constexpr uint32_t VERSION_QUANTIZED = 2;  // 法线/切线八面体量化为int16
 
     static std::unique_ptr<Scene> Load(const std::string& filepath) {
         std::ifstream file(filepath, std::ios::binary);
@@ -41,7 +45,7 @@ public:
         if (magic != MAGIC) {
             throw std::runtime_error("Invalid binary scene file format");
         }
-        if (version != VERSION) {
+        if (version != VERSION && version != VERSION_QUANTIZED) {
             throw std::runtime_error("Unsupported binary scene version");
         }
 
@@ -73,12 +77,36 @@ public:
             }
         }
         
-        LoadMeshes(file, scene.get());
+        LoadMeshes(file, scene.get(), version == VERSION_QUANTIZED);
 
         return scene;
     }
 
 private:
+    // 版本2的顶点布局（28字节），与Python端VERTEX_QUANTIZED_DTYPE一致
+    struct QuantizedVertex {
+        glm::vec3 position;
+        glm::vec2 texCoord;
+        int16_t normal[2];
+        int16_t tangent[2];
+    };
+    static_assert(sizeof(QuantizedVertex) == 28, "QuantizedVertex must match the 28-byte file layout");
+
+    // 八面体编码 (2个snorm16) -> 单位向量
+    // 两个分量都为INT16_MIN表示零向量（例如没有切线），与Python端OCT_ZERO一致
+    static glm::vec3 DecodeOctahedral(const int16_t encoded[2]) {
+        if (encoded[0] == INT16_MIN && encoded[1] == INT16_MIN) {
+            return glm::vec3(0.0f);
+        }
+        float x = std::max(encoded[0] / 32767.0f, -1.0f);
+        float y = std::max(encoded[1] / 32767.0f, -1.0f);
+        float z = 1.0f - std::abs(x) - std::abs(y);
+        float t = std::max(-z, 0.0f);
+        x -= std::copysign(t, x);
+        y -= std::copysign(t, y);
+        return glm::normalize(glm::vec3(x, y, z));
+    }
+
     static std::string ReadString(std::ifstream& file) {
         uint32_t length;
         file.read(reinterpret_cast<char*>(&length), sizeof(length));
@@ -192,7 +220,7 @@ private:
         }
     }
 
-    static void LoadMeshes(std::ifstream& file, Scene* scene) {
+    static void LoadMeshes(std::ifstream& file, Scene* scene, bool quantized) {
         uint32_t count;
         file.read(reinterpret_cast<char*>(&count), sizeof(count));
 
@@ -221,8 +249,20 @@ private:
             static_assert(std::is_standard_layout<Vertex>::value, 
                          "Vertex must be standard layout for binary loading");
             
-            file.read(reinterpret_cast<char*>(vertices.data()), 
-                     vertCount * sizeof(Vertex));
+            if (quantized) {
+                std::vector<QuantizedVertex> packed(vertCount);
+                file.read(reinterpret_cast<char*>(packed.data()),
+                         vertCount * sizeof(QuantizedVertex));
+                for (uint32_t v = 0; v < vertCount; ++v) {
+                    vertices[v].position = packed[v].position;
+                    vertices[v].normal = DecodeOctahedral(packed[v].normal);
+                    vertices[v].texCoord = packed[v].texCoord;
+                    vertices[v].tangent = DecodeOctahedral(packed[v].tangent);
+                }
+            } else {
+                file.read(reinterpret_cast<char*>(vertices.data()), 
+                         vertCount * sizeof(Vertex));
+            }
             
             if (!file.good()) {
                 throw std::runtime_error("Failed to read vertex data for mesh: " + mesh->GetName());
@@ -4,15 +4,13 @@ Provides extensible architecture for adding new format loaders.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Type, List, Optional
+from typing import ClassVar, Dict, Type, List, Optional
 from pathlib import Path
 import logging
 
 from data_structures import SceneData
 
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
 logger = logging.getLogger(__name__)
 
 
@@ -61,11 +59,19 @@ class LoaderRegistry:
         return sorted(cls._loaders.keys())
     
     @classmethod
-    def create_loader(cls, filepath: str) -> Optional['BaseLoader']:
-        """Factory method: create loader instance for given file"""
+    def get_registered_loaders(cls) -> Dict[str, Type['BaseLoader']]:
+        """Get a copy of the extension -> loader class mapping"""
+        return dict(cls._loaders)
+    
+    @classmethod
+    def create_loader(cls, filepath: str, **options) -> Optional['BaseLoader']:
+        """
+        Factory method: create loader instance for given file.
+        Keyword options (validate, log_stats, cache) are forwarded to the loader.
+        """
         loader_class = cls.get_loader(filepath)
         if loader_class:
-            return loader_class(filepath)
+            return loader_class(filepath, **options)
         return None
 
 
@@ -75,9 +81,29 @@ class BaseLoader(ABC):
     All format-specific loaders should inherit from this class.
     """
     
-    def __init__(self, filepath: str):
+    # Human-readable format name; defaults to the class name without 'Loader'
+    FORMAT_NAME: ClassVar[str] = ''
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'FORMAT_NAME' not in cls.__dict__:
+            cls.FORMAT_NAME = cls.__name__.replace('Loader', '')
+    
+    def __init__(self, filepath: str, validate: bool = True, log_stats: bool = True,
+                 cache: bool = False):
+        """
+        Args:
+            filepath: Scene file to load
+            validate: Run validate_scene() after loading
+            log_stats: Log scene statistics after loading
+            cache: Reuse/write on-disk parse caches where the loader supports them
+                (off by default; PyWavefront caches are written next to the input file)
+        """
         self.filepath = Path(filepath)
         self.scene = SceneData()
+        self.validate = validate
+        self.log_stats = log_stats
+        self.cache = cache
         
         if not self.filepath.exists():
             raise FileNotFoundError(f"File not found: {filepath}")
@@ -105,9 +131,10 @@ class BaseLoader(ABC):
         """
         pass
     
-    def get_format_name(self) -> str:
-        """Get human-readable format name"""
-        return self.__class__.__name__.replace('Loader', '')
+    @classmethod
+    def get_format_name(cls) -> str:
+        """Get human-readable format name (available without an instance)"""
+        return cls.FORMAT_NAME
     
     def validate_scene(self) -> bool:
         """
@@ -144,16 +171,24 @@ class BaseLoader(ABC):
         
         return True
     
+    def finalize_scene(self):
+        """Run the post-load validation/statistics steps enabled for this loader"""
+        if self.validate:
+            self.validate_scene()
+        if self.log_stats:
+            self.log_statistics()
+    
     def log_statistics(self):
         """Log scene loading statistics"""
-        total_vertices = sum(len(mesh.vertices) for mesh in self.scene.meshes)
-        total_triangles = sum(len(mesh.indices) // 3 for mesh in self.scene.meshes)
+        # Skip the material scan entirely when INFO records would be dropped anyway
+        if not logger.isEnabledFor(logging.INFO):
+            return
         
         logger.info("=" * 60)
-        logger.info(f"Loaded {self.filepath.name} ({self.get_format_name()} format)")
+        logger.info(f"Loaded {self.filepath.name} ({self.FORMAT_NAME} format)")
         logger.info(f"  Meshes:    {len(self.scene.meshes)}")
-        logger.info(f"  Vertices:  {total_vertices:,}")
-        logger.info(f"  Triangles: {total_triangles:,}")
+        logger.info(f"  Vertices:  {self.scene.total_vertices:,}")
+        logger.info(f"  Triangles: {self.scene.total_triangles:,}")
         logger.info(f"  Materials: {len(self.scene.materials)}")
         logger.info(f"  Textures:  {len(self.scene.textures)}")
         
@@ -3,10 +3,79 @@ Binary Scene Exporter - 高性能二进制格式
 相比JSON减少90%文件大小和解析时间
 """
 
+import mmap
+import os
 import struct
 from pathlib import Path
-from typing import BinaryIO
-from data_structures import SceneData, Mesh, Material, Vertex
+from typing import Tuple
+
+import numpy as np
+
+from data_structures import SceneData, Mesh, Material, TransmissionLayer
+
+
+# 每个顶点: position(3) + normal(3) + texcoord(2) + tangent(3) = 11个float, 44字节
+VERTEX_FLOATS = 11
+VERTEX_SIZE = VERTEX_FLOATS * 4
+
+# 版本2的量化顶点: position(3f) + texcoord(2f) + normal/tangent各2个int16（八面体编码）, 28字节
+VERTEX_QUANTIZED_DTYPE = np.dtype([
+    ('position', '<f4', (3,)),
+    ('texcoord', '<f4', (2,)),
+    ('normal', '<i2', (2,)),
+    ('tangent', '<i2', (2,)),
+])
+OCT_SCALE = 32767.0
+# 零向量（如OBJ路径默认的"无切线"）的编码：两个分量都为INT16_MIN。编码器把普通向量
+# 限制在±32767，不会产生该值；(0, 0)本身表示+Z，不能用来表示零向量
+OCT_ZERO = -32768
+
+# 预编译的结构体格式（避免每次 pack/unpack 重新解析格式字符串）
+_S_U32 = struct.Struct('<I')
+_S_2F = struct.Struct('<2f')
+
+# 材质固定部分：base_color(3f) + emission(3f) + metallic/roughness/ior/opacity(4f)
+# + 纹理索引(4i) + 层标志(I)
+_S_MAT_BODY = struct.Struct('<3f3f4f4iI')
+
+
+def _texture_index(val) -> int:
+    """纹理索引转换为int（-1表示无纹理），处理None和其他类型"""
+    # 接受numpy标量（bpy的numpy路径可能产生np.int32/np.float64），bool不视为索引
+    if isinstance(val, (int, float, np.integer, np.floating)) and not isinstance(val, bool):
+        return int(val)
+    return -1
+
+
+def _oct_encode(vectors: np.ndarray) -> np.ndarray:
+    """单位向量 (N, 3) -> 八面体编码 (N, 2) int16 snorm"""
+    v = np.asarray(vectors, dtype=np.float32)
+    l1 = np.abs(v).sum(axis=1, keepdims=True)
+    zero = l1[:, 0] == 0.0
+    l1[zero] = 1.0
+    v = v / l1
+    xy = v[:, :2].copy()
+    
+    # 下半球折叠到外侧三角形
+    lower = v[:, 2] < 0.0
+    folded = 1.0 - np.abs(xy[lower, ::-1])
+    xy[lower] = np.where(xy[lower] >= 0.0, folded, -folded)
+    
+    encoded = np.round(np.clip(xy, -1.0, 1.0) * OCT_SCALE).astype(np.int16)
+    encoded[zero] = OCT_ZERO
+    return encoded
+
+
+def _oct_decode(encoded: np.ndarray) -> np.ndarray:
+    """八面体编码 (N, 2) int16 -> 单位向量 (N, 3) float32（OCT_ZERO解码为零向量）"""
+    f = np.maximum(encoded.astype(np.float32) / OCT_SCALE, -1.0)
+    x, y = f[:, 0], f[:, 1]
+    z = 1.0 - np.abs(x) - np.abs(y)
+    t = np.maximum(-z, 0.0)
+    v = np.stack((x - np.copysign(t, x), y - np.copysign(t, y), z), axis=1)
+    v /= np.linalg.norm(v, axis=1, keepdims=True)
+    v[(encoded == OCT_ZERO).all(axis=1)] = 0.0
+    return v
 
 
 class BinarySceneExporter:
@@ -15,70 +84,109 @@ class BinarySceneExporter:
     # 文件魔数和版本
     MAGIC = b'ACGS'  # ACG Scene
     VERSION = 1
+    VERSION_QUANTIZED = 2  # 法线/切线八面体量化为int16，顶点28字节
+    
+    def __init__(self, quantize_vectors: bool = False):
+        """
+        Args:
+            quantize_vectors: 以版本2格式导出，法线和切线量化为2个int16
+        """
+        self.quantize_vectors = quantize_vectors
+    
+    @property
+    def version(self) -> int:
+        """本导出器写入的格式版本"""
+        return self.VERSION_QUANTIZED if self.quantize_vectors else self.VERSION
     
     def export(self, scene: SceneData, output_path: str):
-        """导出场景到二进制文件"""
-        with open(output_path, 'wb') as f:
-            self._write_header(f)
-            self._write_materials(f, scene.materials)
-            self._write_textures(f, scene.textures)
-            self._write_meshes(f, scene.meshes)
-    
-    def _write_header(self, f: BinaryIO):
+        """
+        导出场景到二进制文件
+        
+        头部、材质和纹理等小块数据先拼装到内存缓冲区；网格数据的总大小可以预先算出，
+        因此先把文件扩展到最终大小并mmap映射，顶点/索引大块数据直接拷贝进映射，
+        不再经过完整文件大小的中间bytearray。
+        
+        输出目标不是普通文件（管道、/dev/stdout等无法mmap）时，退回到在内存中
+        组装完整文件再一次写出。写入过程中出错时删除不完整的输出文件，避免留下
+        头部有效但内容为零的文件。
+        """
+        head = bytearray()
+        self._write_header(head)
+        self._write_materials(head, scene.materials)
+        self._write_textures(head, scene.textures)
+        
+        mesh_names = [mesh.name.encode('utf-8') for mesh in scene.meshes]
+        total_size = len(head) + self._meshes_size(scene.meshes, mesh_names)
+        
+        output_path = os.fspath(output_path)
+        if os.path.exists(output_path) and not os.path.isfile(output_path):
+            buf = bytearray(total_size)
+            buf[:len(head)] = head
+            self._write_meshes(buf, len(head), scene.meshes, mesh_names)
+            with open(output_path, 'wb') as f:
+                f.write(buf)
+            return
+        
+        try:
+            with open(output_path, 'w+b') as f:
+                f.truncate(total_size)
+                with mmap.mmap(f.fileno(), total_size) as mm:
+                    mm[:len(head)] = head
+                    self._write_meshes(mm, len(head), scene.meshes, mesh_names)
+        except BaseException:
+            try:
+                os.remove(output_path)
+            except OSError:
+                pass
+            raise
+    
+    def _write_header(self, out: bytearray):
         """写入文件头：魔数(4字节) + 版本(4字节)"""
-        f.write(self.MAGIC)
-        f.write(struct.pack('I', self.VERSION))
+        out += self.MAGIC
+        out += _S_U32.pack(self.version)
     
-    def _write_materials(self, f: BinaryIO, materials: list):
+    def _write_materials(self, out: bytearray, materials: list):
         """写入材质数据"""
-        f.write(struct.pack('I', len(materials)))  # 材质数量
+        out += _S_U32.pack(len(materials))  # 材质数量
         
         for mat in materials:
             # 材质名称（长度 + UTF-8字符串）
             name_bytes = mat.name.encode('utf-8')
-            f.write(struct.pack('I', len(name_bytes)))
-            f.write(name_bytes)
-            
-            # PBR参数（紧凑二进制）
-            f.write(struct.pack('3f', *mat.base_color))      # 12字节
-            f.write(struct.pack('3f', *mat.emission))        # 12字节
-            f.write(struct.pack('f', mat.metallic))          # 4字节
-            f.write(struct.pack('f', mat.roughness))         # 4字节
-            f.write(struct.pack('f', mat.ior))               # 4字节
-            f.write(struct.pack('f', mat.opacity))           # 4字节
-            
-            # 纹理索引（4个int，-1表示无纹理）
-            # 确保转换为整数，处理None和其他类型
-            def to_texture_index(val):
-                if val is None or val == -1:
-                    return -1
-                return int(val) if isinstance(val, (int, float)) else -1
+            out += _S_U32.pack(len(name_bytes))
+            out += name_bytes
             
-            f.write(struct.pack('4i', 
-                to_texture_index(mat.base_color_texture),
-                to_texture_index(mat.normal_texture),
-                to_texture_index(mat.metallic_roughness_texture),
-                to_texture_index(mat.emission_texture)
-            ))
+            # 材质层标志（按位拼接，无分支）
+            flags = (
+                (mat.transmission is not None) << 0 |
+                (mat.clearcoat is not None) << 1 |
+                (mat.sheen is not None) << 2 |
+                (mat.subsurface is not None) << 3 |
+                (mat.anisotropy is not None) << 4
+            )
             
-            # 材质层标志
-            flags = 0
-            if mat.transmission:
-                flags |= 0x01
-            if mat.clearcoat:
-                flags |= 0x02
-            if mat.sheen:
-                flags |= 0x04
-            f.write(struct.pack('I', flags))
+            # 固定长度的材质记录，一次pack完成（60字节）
+            out += _S_MAT_BODY.pack(
+                *mat.base_color,                                    # 12字节
+                *mat.emission,                                      # 12字节
+                mat.metallic,                                       # 4字节
+                mat.roughness,                                      # 4字节
+                mat.ior,                                            # 4字节
+                mat.opacity,                                        # 4字节
+                _texture_index(mat.base_color_texture),             # 纹理索引 16字节（-1表示无纹理）
+                _texture_index(mat.normal_texture),
+                _texture_index(mat.metallic_roughness_texture),
+                _texture_index(mat.emission_texture),
+                flags                                               # 4字节
+            )
             
             # 扩展层数据（如果有）
-            if mat.transmission:
+            if flags & 0x01:
                 t = mat.transmission
-                f.write(struct.pack('2f', t.strength, mat.ior))
+                out += _S_2F.pack(t.strength, mat.ior)
     
-    def _write_textures(self, f: BinaryIO, textures: list):
+    def _write_textures(self, out: bytearray, textures: list):
         """写入纹理路径"""
-        f.write(struct.pack('I', len(textures)))
+        out += _S_U32.pack(len(textures))
         for texture in textures:
             # Handle both Texture objects and string paths
             if hasattr(texture, 'path'):
@@ -86,142 +194,237 @@ class BinarySceneExporter:
             else:
                 tex_path = str(texture)
             path_bytes = tex_path.encode('utf-8')
-            f.write(struct.pack('I', len(path_bytes)))
-            f.write(path_bytes)
+            out += _S_U32.pack(len(path_bytes))
+            out += path_bytes
     
-    def _write_meshes(self, f: BinaryIO, meshes: list):
-        """写入网格数据"""
-        f.write(struct.pack('I', len(meshes)))  # 网格数量
+    def _vertex_size(self) -> int:
+        """当前格式下单个顶点的字节数"""
+        return VERTEX_QUANTIZED_DTYPE.itemsize if self.quantize_vectors else VERTEX_SIZE
+    
+    def _meshes_size(self, meshes: list, mesh_names: list) -> int:
+        """网格部分的总字节数（网格数量 + 每个网格的名称/材质/顶点/索引）"""
+        vertex_size = self._vertex_size()
+        size = 4
+        for mesh, name_bytes in zip(meshes, mesh_names):
+            size += 4 + len(name_bytes) + 4
+            size += 4 + mesh.vertex_count * vertex_size
+            size += 4 + len(mesh.indices) * 4
+        return size
+    
+    def _write_meshes(self, buf: mmap.mmap, offset: int, meshes: list, mesh_names: list):
+        """写入网格数据（buf已预先分配好足够空间）"""
+        _S_U32.pack_into(buf, offset, len(meshes))  # 网格数量
+        offset += 4
         
-        for mesh in meshes:
+        for mesh, name_bytes in zip(meshes, mesh_names):
             # 网格名称
-            name_bytes = mesh.name.encode('utf-8')
-            f.write(struct.pack('I', len(name_bytes)))
-            f.write(name_bytes)
+            _S_U32.pack_into(buf, offset, len(name_bytes))
+            offset += 4
+            buf[offset:offset + len(name_bytes)] = name_bytes
+            offset += len(name_bytes)
             
             # 材质索引
-            f.write(struct.pack('I', mesh.material_index))
+            _S_U32.pack_into(buf, offset, mesh.material_index)
+            offset += 4
             
-            # 顶点数据（紧凑存储）
-            f.write(struct.pack('I', len(mesh.vertices)))
-            for v in mesh.vertices:
-                # Position (3 floats)
-                f.write(struct.pack('3f', *v.position))
-                # Normal (3 floats)
-                f.write(struct.pack('3f', *v.normal))
-                # TexCoord (2 floats)
-                f.write(struct.pack('2f', *v.texcoord))
-                # Tangent (3 floats)
-                f.write(struct.pack('3f', *v.tangent))
-                # 每个顶点44字节
+            # 顶点数据（紧凑存储，每个顶点44字节）
+            vertex_count = mesh.vertex_count
+            _S_U32.pack_into(buf, offset, vertex_count)
+            offset += 4
+            if self.quantize_vectors:
+                self._write_quantized_vertex_block(buf, offset, mesh, vertex_count)
+            else:
+                self._write_vertex_block(buf, offset, mesh, vertex_count)
+            offset += vertex_count * self._vertex_size()
             
-            # 索引数据
-            f.write(struct.pack('I', len(mesh.indices)))
-            f.write(struct.pack(f'{len(mesh.indices)}I', *mesh.indices))
+            # 索引数据（整块拷贝，不经过tobytes()中间副本）
+            index_data = np.ascontiguousarray(mesh.indices, dtype=np.uint32)
+            _S_U32.pack_into(buf, offset, len(index_data))
+            offset += 4
+            buf[offset:offset + index_data.nbytes] = memoryview(index_data).cast('B')
+            offset += index_data.nbytes
+    
+    def _write_vertex_block(self, buf: mmap.mmap, offset: int, mesh: Mesh, vertex_count: int):
+        """
+        将SoA顶点属性直接交错写入输出缓冲区
+        
+        在缓冲区的 (N, 11) 顶点块上建立numpy视图，把各属性列逐列拷贝进去，
+        不产生中间拼接数组和bytes副本。
+        """
+        # 已经是文件布局的交错缓冲区：整块拷贝
+        packed = mesh.packed_vertices()
+        if packed is not None:
+            buf[offset:offset + packed.nbytes] = memoryview(packed).cast('B')
+            return
+        
+        dst = np.frombuffer(
+            buf, dtype=np.float32, count=vertex_count * VERTEX_FLOATS, offset=offset
+        ).reshape(vertex_count, VERTEX_FLOATS)
+        try:
+            dst[:, 0:3] = mesh.positions
+            dst[:, 3:6] = mesh.normals
+            dst[:, 6:8] = mesh.texcoords
+            dst[:, 8:11] = mesh.tangents
+        finally:
+            # 无论成功与否都释放视图，否则mmap无法关闭（BufferError会掩盖原始异常）
+            del dst
+    
+    def _write_quantized_vertex_block(self, buf: mmap.mmap, offset: int, mesh: Mesh, vertex_count: int):
+        """版本2：与_write_vertex_block相同，但法线/切线以八面体int16编码写入"""
+        dst = np.frombuffer(buf, dtype=VERTEX_QUANTIZED_DTYPE, count=vertex_count, offset=offset)
+        try:
+            dst['position'] = mesh.positions
+            dst['texcoord'] = mesh.texcoords
+            dst['normal'] = _oct_encode(mesh.normals)
+            dst['tangent'] = _oct_encode(mesh.tangents)
+        finally:
+            del dst
 
 
 class BinarySceneImporter:
     """C++端对应的导入器示例（Python参考实现）"""
     
+    # 小于该大小的文件整体读入内存，更大的文件使用mmap映射
+    MMAP_THRESHOLD = 1 << 20  # 1 MiB
+    
     def load(self, file_path: str) -> SceneData:
-        """从二进制文件加载场景"""
+        """
+        从二进制文件加载场景
+        
+        小文件通过Path.read_bytes一次性读入；大文件通过mmap映射。两种情况都直接在
+        内存视图上解析，网格的顶点/索引数组是该缓冲区的零拷贝视图（mmap映射会在
+        最后一个引用它的数组释放后自动关闭）。
+        """
         scene = SceneData()
+        mv = self._open_buffer(file_path)
         
-        with open(file_path, 'rb') as f:
-            # 验证魔数和版本
-            magic = f.read(4)
-            if magic != BinarySceneExporter.MAGIC:
-                raise ValueError(f"Invalid file format: {magic}")
-            
-            version = struct.unpack('I', f.read(4))[0]
-            if version != BinarySceneExporter.VERSION:
-                raise ValueError(f"Unsupported version: {version}")
-            
-            # 读取数据
-            scene.materials = self._read_materials(f)
-            scene.textures = self._read_textures(f)
-            scene.meshes = self._read_meshes(f)
+        # 验证魔数和版本
+        magic = mv[0:4].tobytes()
+        if magic != BinarySceneExporter.MAGIC:
+            raise ValueError(f"Invalid file format: {magic}")
+        
+        version = _S_U32.unpack_from(mv, 4)[0]
+        if version not in (BinarySceneExporter.VERSION, BinarySceneExporter.VERSION_QUANTIZED):
+            raise ValueError(f"Unsupported version: {version}")
+        
+        # 读取数据
+        offset = 8
+        scene.materials, offset = self._read_materials(mv, offset)
+        scene.textures, offset = self._read_textures(mv, offset)
+        meshes, offset = self._read_meshes(
+            mv, offset, quantized=(version == BinarySceneExporter.VERSION_QUANTIZED)
+        )
+        for mesh in meshes:
+            scene.add_mesh(mesh)
         
         return scene
     
-    def _read_materials(self, f: BinaryIO) -> list:
+    def _open_buffer(self, file_path: str) -> memoryview:
+        """获取整个文件内容的内存视图"""
+        if os.path.getsize(file_path) < self.MMAP_THRESHOLD:
+            return memoryview(Path(file_path).read_bytes())
+        
+        with open(file_path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(mm)
+    
+    def _read_string(self, mv: memoryview, offset: int) -> Tuple[str, int]:
+        """读取字符串（长度 + UTF-8字符串）"""
+        length = _S_U32.unpack_from(mv, offset)[0]
+        offset += 4
+        return mv[offset:offset + length].tobytes().decode('utf-8'), offset + length
+    
+    def _read_materials(self, mv: memoryview, offset: int) -> Tuple[list, int]:
         """读取材质"""
-        count = struct.unpack('I', f.read(4))[0]
+        count = _S_U32.unpack_from(mv, offset)[0]
+        offset += 4
         materials = []
         
         for _ in range(count):
-            mat = Material()
-            
             # 读取名称
-            name_len = struct.unpack('I', f.read(4))[0]
-            mat.name = f.read(name_len).decode('utf-8')
-            
-            # PBR参数
-            mat.base_color = struct.unpack('3f', f.read(12))
-            mat.emission = struct.unpack('3f', f.read(12))
-            mat.metallic = struct.unpack('f', f.read(4))[0]
-            mat.roughness = struct.unpack('f', f.read(4))[0]
-            mat.ior = struct.unpack('f', f.read(4))[0]
-            mat.opacity = struct.unpack('f', f.read(4))[0]
+            name, offset = self._read_string(mv, offset)
+            mat = Material(name=name)
             
-            # 纹理索引
-            tex_indices = struct.unpack('4i', f.read(16))
-            mat.base_color_texture = tex_indices[0] if tex_indices[0] >= 0 else None
+            # 固定长度的材质记录，与导出器相同的Struct一次解包
+            fields = _S_MAT_BODY.unpack_from(mv, offset)
+            offset += _S_MAT_BODY.size
+            mat.base_color = list(fields[0:3])
+            mat.emission = list(fields[3:6])
+            (mat.metallic, mat.roughness, mat.ior, mat.opacity,
+             mat.base_color_texture, mat.normal_texture,
+             mat.metallic_roughness_texture, mat.emission_texture,
+             flags) = fields[6:]
             
-            # 标志
-            flags = struct.unpack('I', f.read(4))[0]
-            # 读取扩展层...
+            # 扩展层数据（与导出器一致：仅Transmission带有数据）
+            if flags & 0x01:
+                strength, _ = _S_2F.unpack_from(mv, offset)
+                mat.transmission = TransmissionLayer(strength=strength)
+                offset += 8
             
             materials.append(mat)
         
-        return materials
+        return materials, offset
     
-    def _read_textures(self, f: BinaryIO) -> list:
+    def _read_textures(self, mv: memoryview, offset: int) -> Tuple[list, int]:
         """读取纹理列表"""
-        count = struct.unpack('I', f.read(4))[0]
+        count = _S_U32.unpack_from(mv, offset)[0]
+        offset += 4
         textures = []
         
         for _ in range(count):
-            path_len = struct.unpack('I', f.read(4))[0]
-            path = f.read(path_len).decode('utf-8')
+            path, offset = self._read_string(mv, offset)
             textures.append(path)
         
-        return textures
+        return textures, offset
     
-    def _read_meshes(self, f: BinaryIO) -> list:
-        """读取网格"""
-        count = struct.unpack('I', f.read(4))[0]
+    def _read_meshes(self, mv: memoryview, offset: int, quantized: bool = False) -> Tuple[list, int]:
+        """读取网格（quantized为True时按版本2的量化顶点布局解析）"""
+        count = _S_U32.unpack_from(mv, offset)[0]
+        offset += 4
         meshes = []
         
         for _ in range(count):
-            mesh = Mesh()
-            
             # 名称
-            name_len = struct.unpack('I', f.read(4))[0]
-            mesh.name = f.read(name_len).decode('utf-8')
+            name, offset = self._read_string(mv, offset)
             
             # 材质索引
-            mesh.material_index = struct.unpack('I', f.read(4))[0]
+            material_index = _S_U32.unpack_from(mv, offset)[0]
+            offset += 4
             
-            # 顶点数据
-            vert_count = struct.unpack('I', f.read(4))[0]
-            for _ in range(vert_count):
-                position = struct.unpack('3f', f.read(12))
-                normal = struct.unpack('3f', f.read(12))
-                texcoord = struct.unpack('2f', f.read(8))
-                tangent = struct.unpack('3f', f.read(12))
-                
-                mesh.vertices.append(Vertex(
-                    position=list(position),
-                    normal=list(normal),
-                    texcoord=list(texcoord),
-                    tangent=list(tangent)
-                ))
+            # 顶点数据（直接映射为 (N, 11) 视图并保存SoA切片，不拷贝、不创建Vertex对象）
+            vert_count = _S_U32.unpack_from(mv, offset)[0]
+            offset += 4
+            if quantized:
+                # 位置/UV仍为零拷贝视图，法线/切线需要解码
+                vertex_data = np.frombuffer(
+                    mv, dtype=VERTEX_QUANTIZED_DTYPE, count=vert_count, offset=offset
+                )
+                offset += vert_count * VERTEX_QUANTIZED_DTYPE.itemsize
+            else:
+                vertex_data = np.frombuffer(
+                    mv, dtype=np.float32, count=vert_count * VERTEX_FLOATS, offset=offset
+                )
+                offset += vert_count * VERTEX_SIZE
             
             # 索引
-            idx_count = struct.unpack('I', f.read(4))[0]
-            mesh.indices = list(struct.unpack(f'{idx_count}I', f.read(idx_count * 4)))
+            idx_count = _S_U32.unpack_from(mv, offset)[0]
+            offset += 4
+            indices = np.frombuffer(mv, dtype=np.uint32, count=idx_count, offset=offset)
+            offset += idx_count * 4
             
+            if quantized:
+                mesh = Mesh(
+                    name=name,
+                    positions=vertex_data['position'],
+                    normals=_oct_decode(vertex_data['normal']),
+                    texcoords=vertex_data['texcoord'],
+                    tangents=_oct_decode(vertex_data['tangent']),
+                    indices=indices,
+                    material_index=material_index
+                )
+            else:
+                # 保留交错缓冲区，重新导出时可整块写出
+                mesh = Mesh.from_packed(name, vertex_data, indices, material_index)
             meshes.append(mesh)
         
-        return meshes
+        return meshes, offset
@@ -4,22 +4,17 @@ Uses bpy (Blender Python API) to load .blend files.
 Supports full Principled BSDF material extraction including advanced layers.
 """
 
+import importlib.util
 import logging
-from typing import List, Dict
+import sys
+from typing import List, Dict, Tuple
 from pathlib import Path
 
-try:
-    import bpy
-    import bmesh
-    HAS_BPY = True
-except ImportError:
-    HAS_BPY = False
-    bpy = None  # Set to None for safe checking
-    bmesh = None
+import numpy as np
 
 from base_loader import BaseLoader, LoaderRegistry
 from data_structures import (
-    SceneData, Mesh, Material, Vertex,
+    SceneData, Mesh, Material,
     ClearcoatLayer, TransmissionLayer, SheenLayer,
     SubsurfaceLayer, AnisotropyLayer
 )
@@ -28,370 +23,397 @@ from data_structures import (
 logger = logging.getLogger(__name__)
 
 
-# Only register if bpy is available
-if HAS_BPY:
-    @LoaderRegistry.register('.blend')
-    class BlenderLoader(BaseLoader):
-        """
-        Loader for Blender .blend files.
-        Requires Blender Python API (bpy) to be available.
-        Supports full Principled BSDF material tree extraction.
-        """
+def _bpy_available() -> bool:
+    """Check whether bpy can be imported without actually importing it (~200MB runtime)"""
+    if 'bpy' in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec('bpy') is not None
+    except (ImportError, ValueError):
+        return False
+
+
+HAS_BPY = _bpy_available()
+
+# Imported lazily on first BlenderLoader construction, see _import_bpy()
+bpy = None
+
+
+def _import_bpy():
+    """Import bpy on first use and cache it at module level"""
+    global bpy
+    if bpy is None:
+        import bpy as bpy_module
+        bpy = bpy_module
+    return bpy
+
+
+class BlenderLoader(BaseLoader):
+    """
+    Loader for Blender .blend files.
+    Requires Blender Python API (bpy) to be available.
+    Supports full Principled BSDF material tree extraction.
+    """
+    
+    FORMAT_NAME = 'Blender'
+    
+    def __init__(self, filepath: str, **options):
+        try:
+            _import_bpy()
+        except ImportError:
+            raise ImportError(
+                "bpy (Blender Python API) not available. "
+                "Install with: pip install bpy\n"
+                "Note: bpy package is large (~200MB) but provides full Blender functionality.\n"
+                f"Alternatively, run through system Blender:\n"
+                f"  blender --background --python main.py -- {filepath} output.json"
+            )
         
-        def __init__(self, filepath: str):
-            if not HAS_BPY:
-                raise ImportError(
-                    "bpy (Blender Python API) not available. "
-                    "Install with: pip install bpy\n"
-                    "Note: bpy package is large (~200MB) but provides full Blender functionality.\n"
-                    f"Alternatively, run through system Blender:\n"
-                    f"  blender --background --python main.py -- {filepath} output.json"
-                )
-            
-            super().__init__(filepath)
+        super().__init__(filepath, **options)
+    
+    def supports_advanced_materials(self) -> bool:
+        """Blender format supports full PBR material layers"""
+        return True
+    
+    def load(self) -> SceneData:
+        """Load Blender file using bpy"""
+        logger.info("Loading Blender file: %s", self.filepath)
         
-        def supports_advanced_materials(self) -> bool:
-            """Blender format supports full PBR material layers"""
-            return True
+        # Clear existing scene
+        bpy.ops.wm.read_factory_settings(use_empty=True)
         
-        def load(self) -> SceneData:
-            """Load Blender file using bpy"""
-            logger.info(f"Loading Blender file: {self.filepath}")
-            
-            # Clear existing scene
-            bpy.ops.wm.read_factory_settings(use_empty=True)
-            
-            # Load blend file
-            bpy.ops.wm.open_mainfile(filepath=str(self.filepath))
-            
-            logger.info(f"Blend file loaded: {len(bpy.data.objects)} objects, "
-                       f"{len(bpy.data.materials)} materials")
-            
-            # Extract materials
-            materials, material_map = self._extract_materials()
-            self.scene.materials = materials
-            
-            # Extract geometry
-            meshes = self._extract_meshes(material_map)
-            self.scene.meshes = meshes
-            
-            # Validate and log statistics
-            self.validate_scene()
-            self.log_statistics()
-            
-            return self.scene
+        # Load blend file
+        bpy.ops.wm.open_mainfile(filepath=str(self.filepath))
         
-        def _extract_materials(self) -> tuple[List[Material], Dict[str, int]]:
-            """Extract materials from Blender scene"""
-            materials = []
-            material_map = {}
-            
-            for mat in bpy.data.materials:
-                logger.debug(f"Processing material: {mat.name}")
-                
-                material = Material(name=mat.name)
-                
-                # Check if material uses nodes (Principled BSDF)
-                if mat.use_nodes and mat.node_tree:
-                    self._extract_principled_bsdf(mat.node_tree, material)
-                else:
-                    logger.warning(f"Material {mat.name} does not use nodes, using defaults")
-                
-                material_map[mat.name] = len(materials)
-                materials.append(material)
-            
-            # Add default material if none exist
-            if not materials:
-                logger.warning("No materials found in Blender file, adding default")
-                materials.append(Material(name="default"))
-                material_map["default"] = 0
-            
-            return materials, material_map
-        
-        def _extract_principled_bsdf(self, node_tree, material: Material):
-            """Extract properties from Principled BSDF node"""
-            # Find Principled BSDF node
-            principled_node = None
-            for node in node_tree.nodes:
-                if node.type == 'BSDF_PRINCIPLED':
-                    principled_node = node
-                    break
+        logger.info("Blend file loaded: %d objects, %d materials",
+                   len(bpy.data.objects), len(bpy.data.materials))
+        
+        # Extract materials
+        materials, material_map = self._extract_materials()
+        self.scene.materials = materials
+        
+        # Extract geometry
+        for mesh in self._extract_meshes(material_map):
+            self.scene.add_mesh(mesh)
+        
+        # Validate and log statistics (unless disabled for this loader)
+        self.finalize_scene()
+        
+        return self.scene
+    
+    def _extract_materials(self) -> tuple[List[Material], Dict[str, int]]:
+        """Extract materials from Blender scene"""
+        materials = []
+        material_map = {}
+        
+        for mat in bpy.data.materials:
+            logger.debug("Processing material: %s", mat.name)
             
-            if not principled_node:
-                logger.warning(f"No Principled BSDF found in {material.name}")
-                return
+            material = Material(name=mat.name)
             
-            inputs = principled_node.inputs
+            # Check if material uses nodes (Principled BSDF)
+            if mat.use_nodes and mat.node_tree:
+                self._extract_principled_bsdf(mat.node_tree, material)
+            else:
+                logger.warning("Material %s does not use nodes, using defaults", mat.name)
             
-            # Base Color
-            if 'Base Color' in inputs:
-                base_color = inputs['Base Color'].default_value
-                material.base_color = [
-                    float(base_color[0]),
-                    float(base_color[1]),
-                    float(base_color[2])
+            material_map[mat.name] = len(materials)
+            materials.append(material)
+        
+        # Add default material if none exist
+        if not materials:
+            logger.warning("No materials found in Blender file, adding default")
+            materials.append(Material(name="default"))
+            material_map["default"] = 0
+        
+        return materials, material_map
+    
+    def _extract_principled_bsdf(self, node_tree, material: Material):
+        """Extract properties from Principled BSDF node"""
+        # Find Principled BSDF node
+        principled_node = None
+        for node in node_tree.nodes:
+            if node.type == 'BSDF_PRINCIPLED':
+                principled_node = node
+                break
+        
+        if not principled_node:
+            logger.warning("No Principled BSDF found in %s", material.name)
+            return
+        
+        # Snapshot socket values into a plain dict once, instead of resolving every
+        # property on the RNA collection twice (membership test + indexing)
+        inputs = {}
+        for socket in principled_node.inputs:
+            if socket.name not in inputs and hasattr(socket, 'default_value'):
+                inputs[socket.name] = socket.default_value
+        
+        # Base Color
+        if 'Base Color' in inputs:
+            base_color = inputs['Base Color']
+            material.base_color = [
+                float(base_color[0]),
+                float(base_color[1]),
+                float(base_color[2])
+            ]
+    
+        # Metallic
+        if 'Metallic' in inputs:
+            material.metallic = float(inputs['Metallic'])
+    
+        # Roughness
+        if 'Roughness' in inputs:
+            material.roughness = float(inputs['Roughness'])
+    
+        # Emission
+        if 'Emission' in inputs:
+            emission = inputs['Emission']
+            if hasattr(emission, '__len__') and len(emission) >= 3:
+                material.emission = [
+                    float(emission[0]),
+                    float(emission[1]),
+                    float(emission[2])
                 ]
+    
+        # IOR
+        if 'IOR' in inputs:
+            material.ior = float(inputs['IOR'])
         
-            # Metallic
-            if 'Metallic' in inputs:
-                material.metallic = float(inputs['Metallic'].default_value)
-        
-            # Roughness
-            if 'Roughness' in inputs:
-                material.roughness = float(inputs['Roughness'].default_value)
-        
-            # Emission
-            if 'Emission' in inputs:
-                emission = inputs['Emission'].default_value
-                if hasattr(emission, '__len__') and len(emission) >= 3:
-                    material.emission = [
-                        float(emission[0]),
-                        float(emission[1]),
-                        float(emission[2])
-                    ]
-        
-            # IOR
-            if 'IOR' in inputs:
-                material.ior = float(inputs['IOR'].default_value)
-            
-            # Alpha (opacity)
-            if 'Alpha' in inputs:
-                material.opacity = float(inputs['Alpha'].default_value)
-            
-            logger.debug(f"  Base: color={material.base_color}, "
-                        f"metallic={material.metallic:.2f}, "
-                        f"roughness={material.roughness:.2f}")
-            
-            # Advanced layers
-            self._extract_transmission(inputs, material)
-            self._extract_clearcoat(inputs, material)
-            self._extract_sheen(inputs, material)
-            self._extract_subsurface(inputs, material)
-            self._extract_anisotropy(inputs, material)
-        
-        def _extract_transmission(self, inputs: dict, material: Material):
-            """Extract transmission (glass) layer"""
-            if 'Transmission' not in inputs:
-                return
-            
-            strength = float(inputs['Transmission'].default_value)
-            if strength < 0.01:
-                return
-            
-            # Transmission roughness (if available, otherwise use base roughness)
-            roughness = material.roughness
-            if 'Transmission Roughness' in inputs:
-                roughness = float(inputs['Transmission Roughness'].default_value)
-            
-            material.transmission = TransmissionLayer(
-                strength=strength,
-                roughness=roughness,
-                depth=0.0,  # Blender doesn't expose this directly
-                color=material.base_color.copy(),
-                texture_idx=-1
-            )
-            
-            logger.debug(f"  Transmission: strength={strength:.2f}, roughness={roughness:.2f}")
+        # Alpha (opacity)
+        if 'Alpha' in inputs:
+            material.opacity = float(inputs['Alpha'])
         
-        def _extract_clearcoat(self, inputs: dict, material: Material):
-            """Extract clearcoat layer"""
-            if 'Clearcoat' not in inputs:
-                return
-            
-            strength = float(inputs['Clearcoat'].default_value)
-            if strength < 0.01:
-                return
-            
-            roughness = 0.0
-            if 'Clearcoat Roughness' in inputs:
-                roughness = float(inputs['Clearcoat Roughness'].default_value)
-            
-            material.clearcoat = ClearcoatLayer(
-                strength=strength,
-                roughness=roughness,
-                ior=1.5,  # Standard clearcoat IOR
-                texture_idx=-1
-            )
-            
-            logger.debug(f"  Clearcoat: strength={strength:.2f}, roughness={roughness:.2f}")
+        logger.debug("  Base: color=%s, metallic=%.2f, roughness=%.2f",
+                    material.base_color, material.metallic, material.roughness)
         
-        def _extract_sheen(self, inputs: dict, material: Material):
-            """Extract sheen (fabric) layer"""
-            if 'Sheen' not in inputs:
-                return
-            
-            strength = float(inputs['Sheen'].default_value)
-            if strength < 0.01:
-                return
-            
-            # Sheen tint (color)
-            color = [1.0, 1.0, 1.0]
-            if 'Sheen Tint' in inputs:
-                tint = inputs['Sheen Tint'].default_value
-                if hasattr(tint, '__len__') and len(tint) >= 3:
-                    color = [float(tint[0]), float(tint[1]), float(tint[2])]
-            
-            material.sheen = SheenLayer(
-                strength=strength,
-                roughness=0.0,  # Blender doesn't expose sheen roughness directly
-                color=color,
-                texture_idx=-1
-            )
-            
-            logger.debug(f"  Sheen: strength={strength:.2f}, color={color}")
+        # Advanced layers
+        self._extract_transmission(inputs, material)
+        self._extract_clearcoat(inputs, material)
+        self._extract_sheen(inputs, material)
+        self._extract_subsurface(inputs, material)
+        self._extract_anisotropy(inputs, material)
+    
+    def _extract_transmission(self, inputs: dict, material: Material):
+        """Extract transmission (glass) layer"""
+        if 'Transmission' not in inputs:
+            return
         
-        def _extract_subsurface(self, inputs: dict, material: Material):
-            """Extract subsurface scattering layer"""
-            if 'Subsurface' not in inputs and 'Subsurface Weight' not in inputs:
-                return
-            
-            # Try 'Subsurface Weight' first (newer Blender versions)
-            strength = 0.0
-            if 'Subsurface Weight' in inputs:
-                strength = float(inputs['Subsurface Weight'].default_value)
-            elif 'Subsurface' in inputs:
-                strength = float(inputs['Subsurface'].default_value)
-            
-            if strength < 0.01:
-                return
-            
-            # Subsurface radius (scattering distance)
-            radius = [1.0, 1.0, 1.0]
-            if 'Subsurface Radius' in inputs:
-                rad = inputs['Subsurface Radius'].default_value
-                if hasattr(rad, '__len__') and len(rad) >= 3:
-                    radius = [float(rad[0]), float(rad[1]), float(rad[2])]
-            
-            # Subsurface color
-            color = material.base_color.copy()
-            if 'Subsurface Color' in inputs:
-                sss_color = inputs['Subsurface Color'].default_value
-                if hasattr(sss_color, '__len__') and len(sss_color) >= 3:
-                    color = [float(sss_color[0]), float(sss_color[1]), float(sss_color[2])]
-            
-            material.subsurface = SubsurfaceLayer(
-                strength=strength,
-                radius=radius,
-                color=color,
-                texture_idx=-1
-            )
-            
-            logger.debug(f"  Subsurface: strength={strength:.2f}, radius={radius}")
+        strength = float(inputs['Transmission'])
+        if strength < 0.01:
+            return
         
-        def _extract_anisotropy(self, inputs: dict, material: Material):
-            """Extract anisotropic reflection layer"""
-            if 'Anisotropic' not in inputs:
-                return
-            
-            strength = float(inputs['Anisotropic'].default_value)
-            if strength < 0.01:
-                return
-            
-            rotation = 0.0
-            if 'Anisotropic Rotation' in inputs:
-                rotation = float(inputs['Anisotropic Rotation'].default_value)
-            
-            material.anisotropy = AnisotropyLayer(
-                strength=strength,
-                rotation=rotation,
-                texture_idx=-1
-            )
-            
-            logger.debug(f"  Anisotropy: strength={strength:.2f}, rotation={rotation:.2f}")
+        # Transmission roughness (if available, otherwise use base roughness)
+        roughness = material.roughness
+        if 'Transmission Roughness' in inputs:
+            roughness = float(inputs['Transmission Roughness'])
         
-        def _extract_meshes(self, material_map: Dict[str, int]) -> List[Mesh]:
-            """Extract geometry from Blender objects"""
-            meshes = []
-            
-            for obj in bpy.data.objects:
-                if obj.type != 'MESH':
-                    continue
-                
-                mesh_data = obj.data
-                logger.debug(f"Processing mesh: {obj.name} "
-                            f"({len(mesh_data.vertices)} verts, "
-                            f"{len(mesh_data.polygons)} faces)")
-                
-                # Get material index
-                mat_idx = 0
-                if obj.material_slots and obj.material_slots[0].material:
-                    mat_name = obj.material_slots[0].material.name
-                    mat_idx = material_map.get(mat_name, 0)
-                
-                # Ensure mesh has UV and normals
-                if not mesh_data.uv_layers:
-                    mesh_data.uv_layers.new(name="UVMap")
-                mesh_data.calc_normals_split()
-                
-                # Triangulate mesh
-                bm = bmesh.new()
-                bm.from_mesh(mesh_data)
-                bmesh.ops.triangulate(bm, faces=bm.faces)
-                bm.to_mesh(mesh_data)
-                bm.free()
-                
-                # Extract vertices and indices
-                vertices, indices = self._extract_vertex_data(mesh_data)
-                
-                mesh = Mesh(
-                    name=obj.name,
-                    vertices=vertices,
-                    indices=indices,
-                    material_index=mat_idx
-                )
-                
-                meshes.append(mesh)
-                logger.debug(f"  Extracted: {len(vertices)} vertices, "
-                            f"{len(indices) // 3} triangles, "
-                            f"material {mat_idx}")
-            
-            return meshes
+        material.transmission = TransmissionLayer(
+            strength=strength,
+            roughness=roughness,
+            depth=0.0,  # Blender doesn't expose this directly
+            color=tuple(material.base_color),
+            texture_index=-1
+        )
+        
+        logger.debug("  Transmission: strength=%.2f, roughness=%.2f", strength, roughness)
+    
+    def _extract_clearcoat(self, inputs: dict, material: Material):
+        """Extract clearcoat layer"""
+        if 'Clearcoat' not in inputs:
+            return
+        
+        strength = float(inputs['Clearcoat'])
+        if strength < 0.01:
+            return
+        
+        roughness = 0.0
+        if 'Clearcoat Roughness' in inputs:
+            roughness = float(inputs['Clearcoat Roughness'])
+        
+        material.clearcoat = ClearcoatLayer(
+            strength=strength,
+            roughness=roughness,
+            ior=1.5,  # Standard clearcoat IOR
+            texture_index=-1
+        )
+        
+        logger.debug("  Clearcoat: strength=%.2f, roughness=%.2f", strength, roughness)
+    
+    def _extract_sheen(self, inputs: dict, material: Material):
+        """Extract sheen (fabric) layer"""
+        if 'Sheen' not in inputs:
+            return
+        
+        strength = float(inputs['Sheen'])
+        if strength < 0.01:
+            return
+        
+        # Sheen tint (color)
+        color = (1.0, 1.0, 1.0)
+        if 'Sheen Tint' in inputs:
+            tint = inputs['Sheen Tint']
+            if hasattr(tint, '__len__') and len(tint) >= 3:
+                color = (float(tint[0]), float(tint[1]), float(tint[2]))
+        
+        material.sheen = SheenLayer(
+            strength=strength,
+            roughness=0.0,  # Blender doesn't expose sheen roughness directly
+            color=color,
+            texture_index=-1
+        )
         
-        def _extract_vertex_data(self, mesh_data) -> tuple[List[Vertex], List[int]]:
-            """Extract vertex and index data from Blender mesh"""
-            vertices = []
-            indices = []
-            uv_layer = mesh_data.uv_layers.active.data if mesh_data.uv_layers else None
+        logger.debug("  Sheen: strength=%.2f, color=%s", strength, color)
+    
+    def _extract_subsurface(self, inputs: dict, material: Material):
+        """Extract subsurface scattering layer"""
+        # Try 'Subsurface Weight' first (newer Blender versions)
+        strength = inputs.get('Subsurface Weight', inputs.get('Subsurface'))
+        if strength is None:
+            return
+        
+        strength = float(strength)
+        if strength < 0.01:
+            return
+        
+        # Subsurface radius (scattering distance); the layer stores a single
+        # mean free path, so average Blender's per-channel radius
+        radius = 1.0
+        if 'Subsurface Radius' in inputs:
+            rad = inputs['Subsurface Radius']
+            if hasattr(rad, '__len__') and len(rad) >= 3:
+                radius = (float(rad[0]) + float(rad[1]) + float(rad[2])) / 3.0
+        
+        # Subsurface color
+        color = tuple(material.base_color)
+        if 'Subsurface Color' in inputs:
+            sss_color = inputs['Subsurface Color']
+            if hasattr(sss_color, '__len__') and len(sss_color) >= 3:
+                color = (float(sss_color[0]), float(sss_color[1]), float(sss_color[2]))
+        
+        material.subsurface = SubsurfaceLayer(
+            strength=strength,
+            radius=radius,
+            color=color,
+            texture_index=-1
+        )
+        
+        logger.debug("  Subsurface: strength=%.2f, radius=%.2f", strength, radius)
+    
+    def _extract_anisotropy(self, inputs: dict, material: Material):
+        """Extract anisotropic reflection layer"""
+        if 'Anisotropic' not in inputs:
+            return
+        
+        strength = float(inputs['Anisotropic'])
+        if strength < 0.01:
+            return
+        
+        rotation = 0.0
+        if 'Anisotropic Rotation' in inputs:
+            rotation = float(inputs['Anisotropic Rotation'])
+        
+        material.anisotropy = AnisotropyLayer(
+            strength=strength,
+            rotation=rotation,
+            texture_index=-1
+        )
+        
+        logger.debug("  Anisotropy: strength=%.2f, rotation=%.2f", strength, rotation)
+    
+    def _extract_meshes(self, material_map: Dict[str, int]) -> List[Mesh]:
+        """Extract geometry from Blender objects"""
+        meshes = []
+        
+        for obj in bpy.data.objects:
+            if obj.type != 'MESH':
+                continue
+            
+            mesh_data = obj.data
+            logger.debug("Processing mesh: %s (%d verts, %d faces)",
+                        obj.name, len(mesh_data.vertices), len(mesh_data.polygons))
+            
+            # Get material index
+            mat_idx = 0
+            if obj.material_slots and obj.material_slots[0].material:
+                mat_name = obj.material_slots[0].material.name
+                mat_idx = material_map.get(mat_name, 0)
+            
+            # Ensure mesh has UV and normals
+            if not mesh_data.uv_layers:
+                mesh_data.uv_layers.new(name="UVMap")
+            mesh_data.calc_normals_split()
+            
+            # Triangulate mesh (loop triangles are computed in place, no bmesh round-trip)
+            mesh_data.calc_loop_triangles()
+            
+            # Extract vertex attributes (SoA) and indices
+            positions, normals, texcoords, tangents, indices = \
+                self._extract_vertex_data(mesh_data)
+            
+            mesh = Mesh(
+                name=obj.name,
+                positions=positions,
+                normals=normals,
+                texcoords=texcoords,
+                tangents=tangents,
+                indices=indices,
+                material_index=mat_idx
+            )
             
-            # Process each polygon (triangle after triangulation)
-            for poly in mesh_data.polygons:
-                for loop_idx in poly.loop_indices:
-                    loop = mesh_data.loops[loop_idx]
-                    vert = mesh_data.vertices[loop.vertex_index]
-                    
-                    # Position
-                    position = [
-                        float(vert.co.x),
-                        float(vert.co.y),
-                        float(vert.co.z)
-                    ]
-                    
-                    # Normal
-                    normal = [
-                        float(loop.normal.x),
-                        float(loop.normal.y),
-                        float(loop.normal.z)
-                    ]
-                    
-                    # UV
-                    if uv_layer:
-                        uv = uv_layer[loop_idx].uv
-                        texcoord = [float(uv[0]), float(uv[1])]
-                    else:
-                        texcoord = [0.0, 0.0]
-                    
-                    # Tangent (compute from UV derivatives, or use default)
-                    # TODO: Calculate proper tangent from UV mapping
-                    tangent = [1.0, 0.0, 0.0]
-                    
-                    vertex = Vertex(
-                        position=position,
-                        normal=normal,
-                        texcoord=texcoord,
-                        tangent=tangent
-                    )
-                    
-                    indices.append(len(vertices))
-                    vertices.append(vertex)
+            # Corners shared between triangles produce identical vertices; merge them
+            mesh = mesh.deduplicate_vertices()
             
-            return vertices, indices
+            meshes.append(mesh)
+            logger.debug("  Extracted: %d vertices, %d triangles, material %d",
+                        mesh.vertex_count, len(mesh.indices) // 3, mat_idx)
+        
+        return meshes
+    
+    def _extract_vertex_data(self, mesh_data) -> Tuple[np.ndarray, ...]:
+        """
+        Extract vertex and index data from Blender mesh.
+        Uses foreach_get to copy each attribute into a numpy array in one C call,
+        emitting one vertex per triangle corner (requires calc_loop_triangles()).
+        """
+        num_verts = len(mesh_data.vertices)
+        num_loops = len(mesh_data.loops)
+        
+        # Loop index of every triangle corner
+        tri_loops = np.empty(len(mesh_data.loop_triangles) * 3, dtype=np.int32)
+        mesh_data.loop_triangles.foreach_get('loops', tri_loops)
+        num_corners = len(tri_loops)
+        
+        # Position: gather per-vertex coordinates through the loop -> vertex mapping
+        coords = np.empty(num_verts * 3, dtype=np.float32)
+        mesh_data.vertices.foreach_get('co', coords)
+        loop_vertex_indices = np.empty(num_loops, dtype=np.int32)
+        mesh_data.loops.foreach_get('vertex_index', loop_vertex_indices)
+        positions = coords.reshape(-1, 3)[loop_vertex_indices[tri_loops]]
+        
+        # Normal (per-loop split normals)
+        normals = np.empty(num_loops * 3, dtype=np.float32)
+        mesh_data.loops.foreach_get('normal', normals)
+        normals = normals.reshape(-1, 3)[tri_loops]
+        
+        # UV
+        if mesh_data.uv_layers:
+            uvs = np.empty(num_loops * 2, dtype=np.float32)
+            mesh_data.uv_layers.active.data.foreach_get('uv', uvs)
+            texcoords = uvs.reshape(-1, 2)[tri_loops]
+        else:
+            texcoords = np.zeros((num_corners, 2), dtype=np.float32)
+        
+        # Tangent (compute from UV derivatives, or use default)
+        # TODO: Calculate proper tangent from UV mapping
+        tangents = np.tile(np.array([1.0, 0.0, 0.0], dtype=np.float32), (num_corners, 1))
+        
+        indices = np.arange(num_corners, dtype=np.uint32)
+        
+        return positions, normals, texcoords, tangents, indices
+
+
+# Only register if bpy is available (checked without importing it)
+if HAS_BPY:
+    LoaderRegistry.register('.blend')(BlenderLoader)
+else:
+    logger.warning("Blender loader not available (bpy not installed). Only OBJ files supported.")
@@ -3,105 +3,358 @@ Scene data structures for transferring model/material data to C++ renderer.
 These classes represent the intermediate format between Python loaders and C++ renderer.
 """
 
-from dataclasses import dataclass, field, asdict
-from typing import List, Optional, Dict, Any
+from __future__ import annotations
 
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import List, Optional, NamedTuple, Tuple
+
+import numpy as np
+
+
+def _accumulate_face_normals_numpy(positions: np.ndarray, triangles: np.ndarray, out: np.ndarray):
+    """Scatter-add area-weighted face normals of (T, 3) triangles onto out (V, 3)"""
+    corners = positions[triangles]  # (T, 3, 3)
+    face_normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    np.add.at(out, triangles.ravel(), np.repeat(face_normals, 3, axis=0))
+
+
+def _accumulate_face_normals_loop(positions, triangles, out):
+    """Same as _accumulate_face_normals_numpy, as a scalar loop for Numba to compile"""
+    for t in range(triangles.shape[0]):
+        i0 = triangles[t, 0]
+        i1 = triangles[t, 1]
+        i2 = triangles[t, 2]
+        ax = positions[i1, 0] - positions[i0, 0]
+        ay = positions[i1, 1] - positions[i0, 1]
+        az = positions[i1, 2] - positions[i0, 2]
+        bx = positions[i2, 0] - positions[i0, 0]
+        by = positions[i2, 1] - positions[i0, 1]
+        bz = positions[i2, 2] - positions[i0, 2]
+        nx = ay * bz - az * by
+        ny = az * bx - ax * bz
+        nz = ax * by - ay * bx
+        out[i0, 0] += nx
+        out[i0, 1] += ny
+        out[i0, 2] += nz
+        out[i1, 0] += nx
+        out[i1, 1] += ny
+        out[i1, 2] += nz
+        out[i2, 0] += nx
+        out[i2, 1] += ny
+        out[i2, 2] += nz
+
+
+# Kernel chosen on first use, so importing this module (every loader and
+# main.py do) never pays for importing Numba or JIT compilation
+_face_normal_kernel = None
+
+
+def _accumulate_face_normals(positions: np.ndarray, triangles: np.ndarray, out: np.ndarray):
+    """
+    Dispatch to the Numba-compiled loop when Numba is installed, otherwise to the
+    NumPy np.add.at kernel. The JIT kernel is serial: triangles share vertices, so
+    a parallel scatter would race (or need a per-thread (V, 3) scratch copy each)
+    """
+    global _face_normal_kernel
+    if _face_normal_kernel is None:
+        try:
+            from numba import njit
+        except ImportError:
+            _face_normal_kernel = _accumulate_face_normals_numpy
+        else:
+            _face_normal_kernel = njit(cache=True, fastmath=True)(_accumulate_face_normals_loop)
+    _face_normal_kernel(positions, triangles, out)
 
-@dataclass
-class Vertex:
-    """Vertex data structure matching C++ Vertex struct"""
-    position: List[float]  # [x, y, z]
-    normal: List[float]    # [nx, ny, nz]
-    texcoord: List[float]  # [u, v]
-    tangent: List[float] = field(default_factory=lambda: [0.0, 0.0, 0.0])
+
+class Vertex(NamedTuple):
+    """
+    Vertex data structure matching C++ Vertex struct.
+    Lightweight immutable record; meshes store vertex data as SoA arrays.
+    """
+    position: Sequence[float]  # [x, y, z]
+    normal: Sequence[float]    # [nx, ny, nz]
+    texcoord: Sequence[float]  # [u, v]
+    tangent: Sequence[float] = (0.0, 0.0, 0.0)
+    
+    @classmethod
+    def from_arrays(cls, positions, normals, texcoords, tangents) -> List['Vertex']:
+        """
+        Build Vertex records for whole (N, k) attribute arrays in bulk: one
+        tolist() per array, then tuple._make per row (no __new__ argument parsing)
+        """
+        return list(map(cls._make, zip(
+            np.asarray(positions).tolist(),
+            np.asarray(normals).tolist(),
+            np.asarray(texcoords).tolist(),
+            np.asarray(tangents).tolist()
+        )))
 
 
 @dataclass
 class Mesh:
-    """Mesh data structure"""
+    """
+    Mesh data structure.
+    Vertex attributes are stored as structure-of-arrays (contiguous float32
+    buffers) so they can be handed to the binary exporter without per-vertex work.
+    """
     name: str
-    vertices: List[Vertex]
-    indices: List[int]
+    positions: np.ndarray   # (N, 3) float32
+    normals: np.ndarray     # (N, 3) float32
+    texcoords: np.ndarray   # (N, 2) float32
+    tangents: np.ndarray    # (N, 3) float32
+    indices: np.ndarray     # (M,) uint32
     material_index: int = 0
+    # Optional interleaved (N, 11) float32 buffer in .acg file layout that the
+    # attribute arrays are views of (see from_packed / packed_vertices)
+    vertex_blob: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Coerce any array-likes to the SoA dtypes; arrays that already match
+        # (including the from_packed column views) pass through uncopied
+        self.positions = np.asarray(self.positions, dtype=np.float32).reshape(-1, 3)
+        self.normals = np.asarray(self.normals, dtype=np.float32).reshape(-1, 3)
+        self.texcoords = np.asarray(self.texcoords, dtype=np.float32).reshape(-1, 2)
+        self.tangents = np.asarray(self.tangents, dtype=np.float32).reshape(-1, 3)
+        self.indices = np.asarray(self.indices, dtype=np.uint32).reshape(-1)
+    
+    def __eq__(self, other):
+        # The generated __eq__ compares the array fields as a tuple, which raises
+        # on truth-testing the elementwise result; compare array contents instead
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.name == other.name
+                and self.material_index == other.material_index
+                and all(np.array_equal(getattr(self, attr), getattr(other, attr))
+                        for attr in ('positions', 'normals', 'texcoords', 'tangents', 'indices')))
+    
+    @classmethod
+    def from_vertices(
+        cls,
+        name: str,
+        vertices: Sequence[Vertex],
+        indices: Sequence[int],
+        material_index: int = 0
+    ) -> 'Mesh':
+        """Build a mesh from a list of Vertex objects (AoS compatibility path)"""
+        count = len(vertices)
+        return cls(
+            name=name,
+            positions=np.array([v.position for v in vertices], dtype=np.float32).reshape(count, 3),
+            normals=np.array([v.normal for v in vertices], dtype=np.float32).reshape(count, 3),
+            texcoords=np.array([v.texcoord for v in vertices], dtype=np.float32).reshape(count, 2),
+            tangents=np.array([v.tangent for v in vertices], dtype=np.float32).reshape(count, 3),
+            indices=np.asarray(indices, dtype=np.uint32),
+            material_index=material_index
+        )
+    
+    @classmethod
+    def from_packed(
+        cls,
+        name: str,
+        vertex_data,
+        indices,
+        material_index: int = 0
+    ) -> 'Mesh':
+        """
+        Wrap an already interleaved vertex buffer (position/normal/texcoord/tangent,
+        11 float32 per vertex) without copying; the exporter writes it verbatim.
+        """
+        blob = np.asarray(vertex_data, dtype=np.float32).reshape(-1, 11)
+        return cls(
+            name=name,
+            positions=blob[:, 0:3],
+            normals=blob[:, 3:6],
+            texcoords=blob[:, 6:8],
+            tangents=blob[:, 8:11],
+            indices=np.asarray(indices, dtype=np.uint32),
+            material_index=material_index,
+            vertex_blob=blob
+        )
+    
+    def packed_vertices(self) -> Optional[np.ndarray]:
+        """
+        Return vertex_blob if the attribute arrays are still the views created
+        by from_packed (i.e. none of them has been replaced), otherwise None.
+        """
+        blob = self.vertex_blob
+        if blob is None or not blob.flags.c_contiguous or len(blob) != len(self.positions):
+            return None
+        base = blob.ctypes.data
+        for array, column in ((self.positions, 0), (self.normals, 3),
+                              (self.texcoords, 6), (self.tangents, 8)):
+            if array.ctypes.data != base + column * 4 or array.strides[0] != blob.strides[0]:
+                return None
+        return blob
+    
+    @property
+    def vertex_count(self) -> int:
+        """Number of vertices in the mesh"""
+        return len(self.positions)
+    
+    def deduplicate_vertices(self) -> 'Mesh':
+        """
+        Merge vertices whose position/normal/texcoord/tangent are all identical.
+        Returns a new mesh whose index buffer references the compacted vertices;
+        unique vertices keep their first-occurrence order.
+        """
+        if self.vertex_count == 0:
+            return self
+        
+        packed = np.hstack((self.positions, self.normals, self.texcoords, self.tangents))
+        _, first, inverse = np.unique(packed, axis=0, return_index=True, return_inverse=True)
+        
+        # np.unique sorts rows; restore first-occurrence order for cache locality
+        order = np.argsort(first)
+        remap = np.empty_like(order)
+        remap[order] = np.arange(len(order))
+        keep = first[order]
+        
+        return Mesh(
+            name=self.name,
+            positions=self.positions[keep],
+            normals=self.normals[keep],
+            texcoords=self.texcoords[keep],
+            tangents=self.tangents[keep],
+            indices=remap[inverse.reshape(-1)][self.indices].astype(np.uint32),
+            material_index=self.material_index
+        )
+    
+    def recompute_normals(self):
+        """
+        Recompute smooth vertex normals from the triangle geometry in one batch.
+        Face normals (area-weighted cross products) are scatter-added to their
+        corner vertices and normalized; vertices without valid faces get +Z.
+        """
+        positions = np.asarray(self.positions, dtype=np.float64)
+        triangles = np.asarray(self.indices, dtype=np.intp).reshape(-1, 3)
+        accumulated = np.zeros((self.vertex_count, 3), dtype=np.float64)
+        
+        if len(triangles):
+            _accumulate_face_normals(positions, triangles, accumulated)
+        
+        # Squared lengths in one fused pass, then a broadcast reciprocal-sqrt scale;
+        # degenerate vertices (length <= 1e-6) are scaled to zero and patched to +Z
+        squared = np.einsum('ij,ij->i', accumulated, accumulated)
+        degenerate = squared <= 1e-12
+        with np.errstate(divide='ignore'):
+            inv_length = np.where(degenerate, 0.0, 1.0 / np.sqrt(squared))
+        accumulated *= inv_length[:, None]
+        accumulated[degenerate] = (0.0, 0.0, 1.0)
+        self.normals = accumulated.astype(np.float32)
+    
+    @property
+    def vertices(self) -> 'VertexView':
+        """Per-vertex view over the SoA buffers, for code that still expects Vertex objects"""
+        return VertexView(self)
+    
+    def iter_vertices(self) -> Iterator[Vertex]:
+        """Iterate Vertex objects (legacy AoS code paths only), built in bulk"""
+        return iter(Vertex.from_arrays(self.positions, self.normals,
+                                       self.texcoords, self.tangents))
 
 
-@dataclass
+class VertexView(Sequence):
+    """Read-only sequence of Vertex objects built lazily from a mesh's SoA buffers"""
+    
+    __slots__ = ('_mesh',)
+    
+    def __init__(self, mesh: Mesh):
+        self._mesh = mesh
+    
+    def __len__(self) -> int:
+        return self._mesh.vertex_count
+    
+    def __getitem__(self, index):
+        mesh = self._mesh
+        if isinstance(index, slice):
+            return Vertex.from_arrays(mesh.positions[index], mesh.normals[index],
+                                      mesh.texcoords[index], mesh.tangents[index])
+        return Vertex(
+            position=mesh.positions[index].tolist(),
+            normal=mesh.normals[index].tolist(),
+            texcoord=mesh.texcoords[index].tolist(),
+            tangent=mesh.tangents[index].tolist()
+        )
+
+
+@dataclass(slots=True, frozen=True)
 class ClearcoatLayer:
     """Clearcoat layer for multi-layer materials"""
     strength: float = 0.0
     roughness: float = 0.0
     ior: float = 1.5
     texture_index: int = -1
-    color: List[float] = field(default_factory=lambda: [1.0, 1.0, 1.0])
+    color: Tuple[float, float, float] = (1.0, 1.0, 1.0)
     padding: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TransmissionLayer:
     """Transmission layer for glass/transparent materials"""
     strength: float = 0.0
     roughness: float = 0.0
     depth: float = 0.0
     texture_index: int = -1
-    color: List[float] = field(default_factory=lambda: [1.0, 1.0, 1.0])
+    color: Tuple[float, float, float] = (1.0, 1.0, 1.0)
     padding: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SheenLayer:
     """Sheen layer for fabric materials"""
     strength: float = 0.0
     roughness: float = 0.0
     tint: float = 0.0
     texture_index: int = -1
-    color: List[float] = field(default_factory=lambda: [1.0, 1.0, 1.0])
+    color: Tuple[float, float, float] = (1.0, 1.0, 1.0)
     padding: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SubsurfaceLayer:
     """Subsurface scattering layer"""
     strength: float = 0.0
     radius: float = 1.0
     scale: float = 1.0
     texture_index: int = -1
-    color: List[float] = field(default_factory=lambda: [1.0, 1.0, 1.0])
+    color: Tuple[float, float, float] = (1.0, 1.0, 1.0)
     padding: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AnisotropyLayer:
     """Anisotropic reflection layer"""
     strength: float = 0.0
     rotation: float = 0.0
     padding0: float = 0.0
     texture_index: int = -1
-    tangent: List[float] = field(default_factory=lambda: [1.0, 0.0, 0.0])
+    tangent: Tuple[float, float, float] = (1.0, 0.0, 0.0)
     padding1: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class IridescenceLayer:
     """Thin-film iridescence layer"""
     strength: float = 0.0
     ior: float = 1.3
     thickness: float = 400.0
     texture_index: int = -1
-    padding: List[float] = field(default_factory=lambda: [0.0, 0.0, 0.0, 0.0])
+    padding: Tuple[float, float, float, float] = (0.0, 0.0, 0.0, 0.0)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VolumeLayer:
     """Volume absorption layer"""
     density: float = 0.0
     anisotropy: float = 0.0
     padding0: float = 0.0
     padding1: float = 0.0
-    absorption_color: List[float] = field(default_factory=lambda: [1.0, 1.0, 1.0])
+    absorption_color: Tuple[float, float, float] = (1.0, 1.0, 1.0)
     padding2: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class Material:
     """
     PBR Material with optional advanced layers.
@@ -136,23 +389,24 @@ class Material:
     iridescence: Optional[IridescenceLayer] = None
     volume: Optional[VolumeLayer] = None
     
+    # (layer attribute, field that enables it, flag bit) for get_layer_flags()
+    _LAYER_SPECS = (
+        ('clearcoat', 'strength', 1 << 0),     # LAYER_CLEARCOAT
+        ('transmission', 'strength', 1 << 1),  # LAYER_TRANSMISSION
+        ('sheen', 'strength', 1 << 2),         # LAYER_SHEEN
+        ('subsurface', 'strength', 1 << 3),    # LAYER_SUBSURFACE
+        ('anisotropy', 'strength', 1 << 4),    # LAYER_ANISOTROPY
+        ('iridescence', 'strength', 1 << 5),   # LAYER_IRIDESCENCE
+        ('volume', 'density', 1 << 6),         # LAYER_VOLUME
+    )
+    
     def get_layer_flags(self) -> int:
         """Calculate layer flags bitmap"""
         flags = 0
-        if self.clearcoat and self.clearcoat.strength > 0.0:
-            flags |= (1 << 0)  # LAYER_CLEARCOAT
-        if self.transmission and self.transmission.strength > 0.0:
-            flags |= (1 << 1)  # LAYER_TRANSMISSION
-        if self.sheen and self.sheen.strength > 0.0:
-            flags |= (1 << 2)  # LAYER_SHEEN
-        if self.subsurface and self.subsurface.strength > 0.0:
-            flags |= (1 << 3)  # LAYER_SUBSURFACE
-        if self.anisotropy and self.anisotropy.strength > 0.0:
-            flags |= (1 << 4)  # LAYER_ANISOTROPY
-        if self.iridescence and self.iridescence.strength > 0.0:
-            flags |= (1 << 5)  # LAYER_IRIDESCENCE
-        if self.volume and self.volume.density > 0.0:
-            flags |= (1 << 6)  # LAYER_VOLUME
+        for attr, enable_field, bit in self._LAYER_SPECS:
+            layer = getattr(self, attr)
+            if layer is not None and getattr(layer, enable_field) > 0.0:
+                flags |= bit
         return flags
 
 
@@ -164,11 +418,26 @@ class Texture:
     height: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class SceneData:
     """Complete scene data for C++ renderer"""
     meshes: List[Mesh] = field(default_factory=list)
     materials: List[Material] = field(default_factory=list)
     textures: List[Texture] = field(default_factory=list)
     
+    # Running totals, maintained by add_mesh()
+    total_vertices: int = 0
+    total_triangles: int = 0
+    
+    def add_mesh(self, mesh: Mesh):
+        """Append a mesh and update the vertex/triangle totals"""
+        self.meshes.append(mesh)
+        self.total_vertices += mesh.vertex_count
+        self.total_triangles += len(mesh.indices) // 3
+    
+    def recompute_normals(self):
+        """Recompute vertex normals of every mesh from its triangles"""
+        for mesh in self.meshes:
+            mesh.recompute_normals()
+    
     # Binary export only - use binary_exporter.py
@@ -5,7 +5,7 @@ Automatically detects file format and uses appropriate loader.
 Outputs binary ACG scene data for C++ renderer.
 
 Usage:
-    python main.py <input_file> <output_acg>
+    python main.py <input_file> <output_acg> [--debug] [--no-validate] [--no-stats] [--cache] [--quantize]
     
 Examples:
     python main.py model.obj scene.acg
@@ -14,99 +14,120 @@ Examples:
 
 import sys
 import os
-from pathlib import Path
+import importlib
 import logging
 from typing import Optional
 
 # Import loader system
 from base_loader import LoaderRegistry, BaseLoader
 from data_structures import SceneData
+from binary_exporter import BinarySceneExporter
+
+# Loader modules by file extension. Importing a module registers its loader,
+# so only the module for the input format is imported (bpy_loader in particular
+# is only loaded for .blend files).
+LOADER_MODULES = {
+    '.obj': 'wavefront_loader',
+    '.mtl': 'wavefront_loader',
+    '.blend': 'bpy_loader',
+}
+
 
-# Import all loaders to trigger registration
-import wavefront_loader
-
-# Try to import bpy_loader (optional, only needed for .blend files)
-try:
-    import bpy_loader
-    HAS_BPY_LOADER = True
-except ImportError as e:
-    HAS_BPY_LOADER = False
-    logger = logging.getLogger(__name__)
-    logger.warning(f"Blender loader not available (bpy not installed). Only OBJ files supported.")
-    logger.debug(f"Import error: {e}")
-
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='[%(levelname)s] %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 
-def load_scene(input_file: str, output_file: str) -> bool:
+def import_loader_module(extension: str) -> bool:
+    """
+    Import the loader module registered for a file extension.
+    
+    Returns:
+        bool: True if the module was imported (or no module is mapped)
+    """
+    module_name = LOADER_MODULES.get(extension.lower())
+    if module_name is None:
+        return True
+    
+    try:
+        importlib.import_module(module_name)
+        return True
+    except ImportError as e:
+        logger.warning("Loader module %s not available for %s files", module_name, extension)
+        logger.debug("Import error: %s", e)
+        return False
+
+
+def import_all_loader_modules():
+    """Import every known loader module (used to list supported formats)"""
+    for extension in LOADER_MODULES:
+        import_loader_module(extension)
+
+
+def load_scene(input_file: str, output_file: str, quantize_vectors: bool = False,
+               **loader_options) -> bool:
     """
     Main loading function using factory pattern.
     
     Args:
         input_file: 输入模型文件路径
         output_file: 输出ACG二进制文件路径
+        quantize_vectors: 以版本2格式导出（法线/切线量化为int16）
+        **loader_options: 传给加载器的选项（validate, log_stats, cache）
     
     Returns:
         bool: True if successful, False otherwise
     """
-    input_path = Path(input_file)
-    output_path = Path(output_file)
+    input_file = os.fspath(input_file)
+    output_file = os.fspath(output_file)
     
     # 强制使用二进制格式
-    if not output_path.suffix == '.acg':
-        logger.warning(f"Output file should have .acg extension, got: {output_path.suffix}")
+    output_ext = os.path.splitext(output_file)[1]
+    if output_ext != '.acg':
+        logger.warning("Output file should have .acg extension, got: %s", output_ext)
     
     # Validate input file
-    if not input_path.exists():
-        logger.error(f"Input file not found: {input_file}")
+    if not os.path.exists(input_file):
+        logger.error("Input file not found: %s", input_file)
         return False
     
-    # Get appropriate loader via factory
-    loader = LoaderRegistry.create_loader(str(input_path))
+    # Import only the loader needed for this format, then get it via factory
+    import_loader_module(os.path.splitext(input_file)[1])
+    loader = LoaderRegistry.create_loader(input_file, **loader_options)
     
     if loader is None:
-        logger.error(f"No loader available for file: {input_file}")
-        logger.info(f"Supported formats: {', '.join(LoaderRegistry.list_supported_formats())}")
+        logger.error("No loader available for file: %s", input_file)
+        import_all_loader_modules()
+        logger.info("Supported formats: %s", ', '.join(LoaderRegistry.list_supported_formats()))
         return False
     
     try:
         # Load scene
-        logger.info(f"Loading scene from: {input_file}")
-        logger.info(f"Using loader: {loader.get_format_name()}")
+        logger.info("Loading scene from: %s", input_file)
+        logger.info("Using loader: %s", type(loader).FORMAT_NAME)
         
         scene = loader.load()
         
         # Save to binary format
-        logger.info(f"Saving scene to binary format: {output_file}")
-        from binary_exporter import BinarySceneExporter
-        exporter = BinarySceneExporter()
-        exporter.export(scene, str(output_path))
+        logger.info("Saving scene to binary format: %s", output_file)
+        exporter = BinarySceneExporter(quantize_vectors=quantize_vectors)
+        exporter.export(scene, output_file)
         
         logger.info("✓ Scene loading completed successfully")
         return True
         
     except Exception as e:
-        logger.error(f"Failed to load scene: {e}")
-        import traceback
-        traceback.print_exc()
+        # Traceback goes through the logging handlers instead of straight to stderr
+        logger.exception("Failed to load scene: %s", e)
         return False
 
 
 def print_usage():
     """Print usage information"""
-    print(__doc__)
-    print("\nSupported Formats:")
-    for ext in LoaderRegistry.list_supported_formats():
-        loader_class = LoaderRegistry.get_loader(f"test{ext}")
-        if loader_class:
-            loader_name = loader_class.__name__
-            print(f"  {ext:10} -> {loader_name}")
+    import_all_loader_modules()
+    loaders = LoaderRegistry.get_registered_loaders()
+    # Build the whole text first and emit it with a single write
+    lines = [__doc__, "\n\nSupported Formats:\n"]
+    lines.extend(f"  {ext:10} -> {loaders[ext].__name__}\n" for ext in sorted(loaders))
+    sys.stdout.write("".join(lines))
 
 
 def main():
@@ -121,6 +142,16 @@ def main():
         # Normal Python execution
         args = args[1:]
     
+    # Configure logging here rather than at import, so importing this module
+    # does not reconfigure the host application's logging
+    debug = '--debug' in args or '-v' in args
+    logging.basicConfig(
+        level=logging.DEBUG if debug else logging.INFO,
+        format='[%(levelname)s] %(message)s'
+    )
+    if debug:
+        logger.debug("Debug logging enabled")
+    
     # Parse arguments
     if len(args) < 2:
         print("ERROR: Missing required arguments\n", file=sys.stderr)
@@ -130,13 +161,19 @@ def main():
     input_file = args[0]
     output_file = args[1]
     
-    # Enable debug logging if requested
-    if '--debug' in args or '-v' in args:
-        logging.getLogger().setLevel(logging.DEBUG)
-        logger.debug("Debug logging enabled")
+    # Post-load validation/statistics are on by default, parse caches are opt-in
+    loader_options = {
+        'validate': '--no-validate' not in args,
+        'log_stats': '--no-stats' not in args,
+        'cache': '--cache' in args,
+    }
     
     # Load and convert scene to binary format
-    success = load_scene(input_file, output_file)
+    success = load_scene(
+        input_file, output_file,
+        quantize_vectors='--quantize' in args,
+        **loader_options
+    )
     
     if not success:
         sys.exit(1)
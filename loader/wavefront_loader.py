@@ -4,22 +4,42 @@ Uses PyWavefront library to parse OBJ and MTL files.
 Extracts geometry and converts Phong materials to PBR approximations.
 """
 
+import functools
+import hashlib
+import json
+import mmap
 import os
+import pickle
+import re
+import struct
+import sys
+import zlib
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 import logging
 
+import numpy as np
+
 try:
     import pywavefront
     from pywavefront import Wavefront
+    from pywavefront.cache import CacheLoader, CacheWriter, cache_name, meta_name
+    from pywavefront.obj import ObjParser
 except ImportError:
     raise ImportError(
         "pywavefront not installed. Install with: pip install pywavefront"
     )
 
+# Optional: zstandard compresses/decompresses the scene cache faster than zlib
+try:
+    import zstandard as zstd
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
 from base_loader import BaseLoader, LoaderRegistry
 from data_structures import (
-    SceneData, Mesh, Material, Vertex, Texture,
+    SceneData, Mesh, Material, Texture,
     TransmissionLayer
 )
 
@@ -27,6 +47,123 @@ from data_structures import (
 logger = logging.getLogger(__name__)
 
 
+class _ArrayCacheLoader(CacheLoader):
+    """PyWavefront cache loader that reads vertex buffers straight into float32 arrays"""
+    
+    def load_vertex_buffer(self, fd, material, length):
+        # One read + a zero-copy view instead of struct.unpack into a tuple of floats
+        material.vertices = np.frombuffer(fd.read(length), dtype='<f4')
+
+
+class _CacheWriter(CacheWriter):
+    """PyWavefront cache writer that skips the cache when it can't be written"""
+    
+    def write(self):
+        try:
+            super().write()
+        except OSError as e:
+            # e.g. a read-only OBJ directory: the OBJ is already parsed, so load
+            # it without a cache and drop whatever was half written
+            logger.warning(f"Failed to write PyWavefront cache for {self.file_name.name}: {e}")
+            for path in (cache_name(self.file_name), meta_name(self.file_name)):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+
+class _ObjParser(ObjParser):
+    cache_loader_cls = _ArrayCacheLoader
+    cache_writer_cls = _CacheWriter
+
+
+class _Wavefront(Wavefront):
+    """Wavefront scene whose cached loads yield NumPy vertex buffers"""
+    parser_cls = _ObjParser
+
+
+# Scene cache header; bump the version when SceneData/Mesh/Material or the
+# header change shape so old scene caches are ignored
+_SCENE_CACHE_MAGIC = b'ACGC'
+_SCENE_CACHE_VERSION = 2
+_SCENE_CACHE_KEY_SIZE = hashlib.sha256().digest_size
+_S_U32 = struct.Struct('<I')
+
+
+def _file_signature(path: str) -> Optional[List[int]]:
+    """[mtime_ns, size] of a file, or None if it doesn't exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _scene_cache_dir() -> Path:
+    """Per-user scene cache directory (%LOCALAPPDATA% on Windows, else $XDG_CACHE_HOME or ~/.cache)"""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local'
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'acg_project' / 'scenes'
+
+if HAS_ZSTD:
+    def _compress(data: bytes) -> bytes:
+        return zstd.ZstdCompressor(level=3).compress(data)
+    
+    def _decompress(data: bytes) -> bytes:
+        return zstd.ZstdDecompressor().decompress(data)
+else:
+    def _compress(data: bytes) -> bytes:
+        return zlib.compress(data, 3)
+    
+    def _decompress(data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+# Inline MTL comment (e.g. "Ka 0.5 0.5 0.5 # comment"). Full-line comments are
+# excluded by the lookahead; the atomic group scans lines without '#' linearly.
+_MTL_COMMENT_RE = re.compile(r'^(?![ \t]*#)((?>[^#\n]*))#.*$', re.MULTILINE)
+
+# mtllib statement in the OBJ file; matched on the raw bytes
+_MTLLIB_RE = re.compile(rb'^[ \t]*mtllib[ \t]+([^\r\n]+)', re.MULTILINE)
+
+# newmtl (group 1: material name) and numeric Tf (groups 2-4: r g b) statements
+# in MTL text; spectral/CIEXYZ Tf forms don't match and are ignored
+_FLOAT_PATTERN = r'([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)(?=\s|$)'
+_MTL_TF_RE = re.compile(
+    r'^[ \t]*(?:newmtl[ \t]+([^\r\n]*\S)'
+    r'|Tf[ \t]+' + _FLOAT_PATTERN + r'[ \t]+' + _FLOAT_PATTERN + r'[ \t]+' + _FLOAT_PATTERN + ')',
+    re.MULTILINE
+)
+
+# Component size in a vertex format token (e.g. "V3F" -> 3)
+_DIGITS_RE = re.compile(r'\d+')
+
+
+def _strip_inline_comments(text: str) -> str:
+    """Remove inline comments (and the whitespace before them) from MTL text"""
+    # Most MTL files have no comments at all: one C-level find, no regex sweep
+    if '#' not in text:
+        return text
+    return _MTL_COMMENT_RE.sub(lambda m: m.group(1).rstrip(), text)
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_texture_file(obj_dir: str, tex_filename: str) -> str:
+    """
+    Resolve a texture reference to an interned absolute path ("" if missing).
+    Cached so textures shared by many materials are only stat'ed once per load.
+    """
+    tex_path = Path(obj_dir) / tex_filename
+    
+    if tex_path.exists():
+        return sys.intern(str(tex_path.resolve()))
+    else:
+        logger.warning(f"Texture not found: {tex_path}")
+        return ""
+
+
 @LoaderRegistry.register('.obj', '.mtl')
 class WavefrontLoader(BaseLoader):
     """
@@ -34,26 +171,43 @@ class WavefrontLoader(BaseLoader):
     Converts traditional Phong/Blinn materials to PBR approximations.
     """
     
+    FORMAT_NAME = 'Wavefront'
+    
     def supports_advanced_materials(self) -> bool:
         """OBJ/MTL format has limited PBR support, mostly converted from Phong"""
         return False  # Basic transparency only, no clearcoat/transmission/sheen
     
     def load(self) -> SceneData:
         """Load OBJ file with PyWavefront"""
+        # Reuse the scene from a previous load if the OBJ/MTL files are unchanged
+        if self.cache:
+            cached_scene = self._load_scene_cache()
+            if cached_scene is not None:
+                self.scene = cached_scene
+                self.finalize_scene()
+                return self.scene
+        
         logger.info(f"Parsing OBJ file with PyWavefront: {self.filepath}")
         
-        # Preprocess MTL files to remove inline comments
-        self._preprocess_mtl_files()
+        # Texture files may have changed since a previous load in this process
+        _resolve_texture_file.cache_clear()
+        self._texture_references = set()
         
-        # Extract Tf values before PyWavefront parsing (PyWavefront doesn't support it)
-        tf_values = self._extract_tf_values()
+        # Clean MTL inline comments and extract Tf values in one pass over each
+        # MTL file, before PyWavefront parsing (PyWavefront doesn't support Tf)
+        tf_values = self._scan_mtl_files()
         
-        # Parse with PyWavefront
-        wavefront_scene = Wavefront(
+        # Parse with PyWavefront. With caching enabled (--cache) PyWavefront
+        # stores the parsed vertex buffers next to the OBJ (<name>.obj.bin,
+        # gzipped, and <name>.obj.json metadata) and reloads them instead of
+        # re-parsing
+        use_cache = self.cache and self._invalidate_stale_cache()
+        wavefront_scene = _Wavefront(
             str(self.filepath),
             collect_faces=True,
             parse=True,
-            create_materials=True
+            create_materials=True,
+            cache=use_cache
         )
         
         # Extract materials and collect textures
@@ -65,232 +219,254 @@ class WavefrontLoader(BaseLoader):
         logger.info(f"Collected {len(self.scene.textures)} unique textures")
         
         # Extract geometry
-        meshes = self._extract_meshes(wavefront_scene, materials)
-        self.scene.meshes = meshes
+        for mesh in self._extract_meshes(wavefront_scene, materials):
+            self.scene.add_mesh(mesh)
         
-        # Validate and log statistics
-        self.validate_scene()
-        self.log_statistics()
+        if self.cache:
+            self._write_scene_cache()
+        
+        # Validate and log statistics (unless disabled for this loader)
+        self.finalize_scene()
         
         return self.scene
     
-    def _preprocess_mtl_files(self):
-        """Preprocess MTL files to remove inline comments that cause parsing errors"""
-        # Find referenced MTL files in the OBJ file
-        obj_dir = Path(self.filepath).parent
-        mtl_files = []
+    @property
+    def _scene_cache_path(self) -> Path:
+        """
+        <digest of the OBJ path>.scene.zst (or .scene.zlib without zstandard) in
+        the per-user cache directory. Never next to the OBJ: scene folders often
+        come from downloaded archives, and a cache file shipped in one would be
+        unpickled.
+        """
+        suffix = '.scene.zst' if HAS_ZSTD else '.scene.zlib'
+        name = hashlib.sha256(str(self.filepath.resolve()).encode('utf-8')).hexdigest()
+        return _scene_cache_dir() / (name + suffix)
+    
+    def _scene_cache_key(self) -> bytes:
+        """
+        32-byte digest of the cache format version and the absolute paths,
+        mtimes and sizes of the OBJ and its MTL files
+        """
+        digest = hashlib.sha256(f"{_SCENE_CACHE_VERSION}".encode())
+        for path in [self.filepath] + self._mtl_files:
+            stat = path.stat()
+            digest.update(f"|{path.resolve()}|{stat.st_mtime_ns}|{stat.st_size}".encode())
+        return digest.digest()
+    
+    def _load_scene_cache(self) -> Optional[SceneData]:
+        """
+        Return the cached SceneData if the cache is current, otherwise None.
+        
+        File layout: magic + version (u32) + key (32 bytes) + texture dependency
+        JSON (u32 length + UTF-8) + compressed pickle. Magic, version, key and
+        texture files are all checked before anything is unpickled.
+        
+        Note: the payload is a pickle, which can run arbitrary code when loaded.
+        The checks above only detect stale caches, they do not authenticate the
+        file; that is why the cache is opt-in (--cache) and only read from the
+        per-user cache directory.
+        """
+        cache_path = self._scene_cache_path
+        try:
+            data = cache_path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Failed to read scene cache {cache_path}: {e}")
+            return None
+        
+        header_size = len(_SCENE_CACHE_MAGIC) + 4 + _SCENE_CACHE_KEY_SIZE + 4
+        if (len(data) < header_size
+                or data[:len(_SCENE_CACHE_MAGIC)] != _SCENE_CACHE_MAGIC
+                or _S_U32.unpack_from(data, len(_SCENE_CACHE_MAGIC))[0] != _SCENE_CACHE_VERSION):
+            logger.info(f"Scene cache for {self.filepath.name} has an unknown format, re-parsing")
+            return None
+        
+        offset = len(_SCENE_CACHE_MAGIC) + 4
+        if data[offset:offset + _SCENE_CACHE_KEY_SIZE] != self._scene_cache_key():
+            logger.info(f"Scene cache for {self.filepath.name} is stale, re-parsing")
+            return None
+        offset += _SCENE_CACHE_KEY_SIZE
         
-        # Read OBJ to find mtllib references
         try:
-            with open(self.filepath, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('mtllib '):
-                        mtl_name = line[7:].strip()
-                        mtl_path = obj_dir / mtl_name
-                        if mtl_path.exists():
-                            mtl_files.append(mtl_path)
+            deps_size = _S_U32.unpack_from(data, offset)[0]
+            offset += 4
+            dependencies = json.loads(data[offset:offset + deps_size].decode('utf-8'))
+            offset += deps_size
+        except ValueError as e:
+            logger.warning(f"Corrupt scene cache {cache_path}: {e}")
+            return None
+        
+        # Texture references that were found/missing must still be found/missing
+        # and unchanged, otherwise the cached texture list is wrong
+        if any(_file_signature(path) != signature for path, signature in dependencies.items()):
+            logger.info(f"Textures of {self.filepath.name} changed, re-parsing")
+            return None
+        
+        try:
+            scene = pickle.loads(_decompress(data[offset:]))
         except Exception as e:
-            logger.warning(f"Failed to read OBJ file for MTL references: {e}")
-            return
+            logger.warning(f"Failed to load scene cache {cache_path}: {e}")
+            return None
         
-        # Clean each MTL file
-        for mtl_path in mtl_files:
-            try:
-                # Read original content
-                with open(mtl_path, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                
-                # Remove inline comments (but keep full-line comments)
-                cleaned_lines = []
-                for line in lines:
-                    stripped = line.strip()
-                    # Keep empty lines and full-line comments
-                    if not stripped or stripped.startswith('#'):
-                        cleaned_lines.append(line)
-                        continue
-                    
-                    # Remove inline comments (e.g., "Ka 0.5 0.5 0.5 # comment")
-                    # Split at # and take only the first part
-                    if '#' in line:
-                        line = line.split('#')[0].rstrip() + '\n'
-                    
-                    cleaned_lines.append(line)
-                
-                # Write back cleaned content
-                with open(mtl_path, 'w', encoding='utf-8') as f:
-                    f.writelines(cleaned_lines)
-                
-                logger.info(f"Cleaned MTL file: {mtl_path.name}")
-            except Exception as e:
-                logger.warning(f"Failed to clean MTL file {mtl_path}: {e}")
+        logger.info(f"Loaded cached scene: {cache_path}")
+        return scene
     
-    def _extract_tf_values(self) -> dict:
-        """Extract Tf (transmission filter) values from MTL files before PyWavefront parsing"""
-        tf_dict = {}  # material_name -> [r, g, b]
+    def _write_scene_cache(self):
+        """Pickle (protocol 5) and compress self.scene behind the cache header"""
+        cache_path = self._scene_cache_path
+        tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+        try:
+            cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            dependencies = json.dumps({
+                path: _file_signature(path) for path in sorted(self._texture_references)
+            }).encode('utf-8')
+            payload = _compress(pickle.dumps(self.scene, protocol=5))
+            with open(tmp_path, 'wb') as f:
+                f.write(_SCENE_CACHE_MAGIC)
+                f.write(_S_U32.pack(_SCENE_CACHE_VERSION))
+                f.write(self._scene_cache_key())
+                f.write(_S_U32.pack(len(dependencies)))
+                f.write(dependencies)
+                f.write(payload)
+            # Atomic replace so a concurrent reader never sees a partial file
+            os.replace(tmp_path, cache_path)
+            logger.debug(f"Wrote scene cache: {cache_path}")
+        except Exception as e:
+            logger.warning(f"Failed to write scene cache {cache_path}: {e}")
+    
+    def _invalidate_stale_cache(self) -> bool:
+        """
+        Delete PyWavefront cache files that are older than the OBJ or its MTL
+        files. Returns False if a stale cache could not be deleted, in which
+        case PyWavefront must not use the cache.
+        """
+        cache_files = [cache_name(self.filepath), meta_name(self.filepath)]
+        try:
+            cache_mtime = min(path.stat().st_mtime for path in cache_files)
+        except FileNotFoundError:
+            cache_mtime = None
+        
+        if cache_mtime is not None:
+            sources = [self.filepath] + self._mtl_files
+            if all(path.stat().st_mtime <= cache_mtime for path in sources):
+                return True
+            logger.info(f"PyWavefront cache for {self.filepath.name} is stale, re-parsing")
         
+        # Remove both (or a leftover half) so PyWavefront regenerates them
+        for path in cache_files:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Failed to delete stale PyWavefront cache {path.name}: {e}")
+                return False
+        return True
+    
+    @functools.cached_property
+    def _mtl_files(self) -> List[Path]:
+        """
+        Existing MTL files referenced by mtllib statements in the OBJ file.
+        Found with one regex sweep over a memory-mapped OBJ (no per-line Python
+        work) and cached, since the MTL scan and cache check both need it.
+        """
         obj_dir = Path(self.filepath).parent
+        mtl_files = []
+        
         try:
-            with open(self.filepath, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('mtllib '):
-                        mtl_name = line[7:].strip()
-                        mtl_path = obj_dir / mtl_name
-                        if mtl_path.exists():
-                            self._parse_tf_from_mtl(mtl_path, tf_dict)
+            with open(self.filepath, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return mtl_files
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    mtl_names = [m.group(1).decode('utf-8').strip() for m in _MTLLIB_RE.finditer(mm)]
         except Exception as e:
-            logger.warning(f"Failed to extract Tf values: {e}")
+            logger.warning(f"Failed to read OBJ file for MTL references: {e}")
+            return mtl_files
+        
+        for mtl_name in mtl_names:
+            mtl_path = obj_dir / mtl_name
+            if mtl_name and mtl_path.is_file():
+                mtl_files.append(mtl_path)
+        
+        return mtl_files
+    
+    def _scan_mtl_files(self) -> dict:
+        """
+        Read each referenced MTL file once: remove inline comments that cause
+        PyWavefront parsing errors (writing the file back only if it changed) and
+        collect Tf (transmission filter) values, which PyWavefront doesn't support.
+        
+        Returns:
+            dict: material_name -> [r, g, b]
+        """
+        tf_dict = {}
+        
+        for mtl_path in self._mtl_files:
+            try:
+                text = mtl_path.read_text(encoding='utf-8')
+            except Exception as e:
+                logger.warning(f"Failed to read MTL file {mtl_path}: {e}")
+                continue
+            
+            cleaned = _strip_inline_comments(text)
+            
+            # Leave the file untouched when it had no inline comments
+            if cleaned != text:
+                try:
+                    mtl_path.write_text(cleaned, encoding='utf-8')
+                    logger.info(f"Cleaned MTL file: {mtl_path.name}")
+                except Exception as e:
+                    logger.warning(f"Failed to clean MTL file {mtl_path}: {e}")
+            
+            self._parse_tf_values(cleaned, tf_dict)
         
         return tf_dict
     
-    def _parse_tf_from_mtl(self, mtl_path: Path, tf_dict: dict):
-        """Parse Tf values from a single MTL file"""
+    def _parse_tf_values(self, mtl_text: str, tf_dict: dict):
+        """Parse Tf values from the contents of a single MTL file"""
         current_material = None
-        try:
-            with open(mtl_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('newmtl '):
-                        current_material = line[7:].strip()
-                    elif line.startswith('Tf ') and current_material:
-                        parts = line[3:].split()
-                        if len(parts) >= 3:
-                            try:
-                                tf_dict[current_material] = [
-                                    float(parts[0]),
-                                    float(parts[1]),
-                                    float(parts[2])
-                                ]
-                                logger.debug(f"Extracted Tf for {current_material}: {tf_dict[current_material]}")
-                            except ValueError:
-                                pass
-        except Exception as e:
-            logger.warning(f"Failed to parse Tf from {mtl_path}: {e}")
+        tf_names = []
+        tf_components = []
+        # One regex sweep over the whole text; only newmtl/numeric Tf lines match
+        for match in _MTL_TF_RE.finditer(mtl_text):
+            name, *rgb = match.groups()
+            if name is not None:
+                current_material = name
+            elif current_material:
+                tf_names.append(current_material)
+                tf_components.append(rgb)
+        
+        if not tf_components:
+            return
+        
+        # The regex only accepts float literals, so the whole file's Tf values
+        # convert in one C-level call instead of three float() calls per line
+        for name, tf in zip(tf_names, np.array(tf_components, dtype=np.float64).tolist()):
+            tf_dict[name] = tf
+            logger.debug(f"Extracted Tf for {name}: {tf}")
     
     def _extract_materials(self, wavefront_scene: Wavefront, tf_values: dict) -> tuple[List[Material], List[str]]:
         """Extract materials from PyWavefront scene, return materials and unique texture paths"""
         materials = []
         texture_paths = []  # Unique texture paths
-        texture_map = {}    # Path -> index mapping
+        texture_map = {}    # Normalized path -> index mapping
         
         def add_texture(tex_path: str) -> int:
             """Add texture to list and return its index"""
             if not tex_path:
                 return -1
-            if tex_path not in texture_map:
-                texture_map[tex_path] = len(texture_paths)
+            # Case-insensitive filesystems: differently cased references are one texture
+            key = os.path.normcase(tex_path)
+            if key not in texture_map:
+                texture_map[key] = len(texture_paths)
                 texture_paths.append(tex_path)
-            return texture_map[tex_path]
+            return texture_map[key]
         
         for mat_name, mat in wavefront_scene.materials.items():
             logger.debug(f"Processing material: {mat_name}")
             
-            material = Material(name=mat_name)
-            
-            # Check illumination model for special handling
-            illum = getattr(mat, 'illumination_model', 2)
-            is_mirror = (illum == 5)  # Perfect mirror
-            is_glass = (illum == 7)   # Glass (refraction + reflection)
-            
-            logger.debug(f"  illum mode: {illum} (mirror={is_mirror}, glass={is_glass})")
-            
-            # Diffuse color -> base color
-            # For mirror materials, prefer specular color as base_color
-            if is_mirror and hasattr(mat, 'specular') and mat.specular:
-                material.base_color = [
-                    float(mat.specular[0]),
-                    float(mat.specular[1]),
-                    float(mat.specular[2])
-                ]
-                logger.debug(f"  Using specular as base_color for mirror: {material.base_color}")
-            elif hasattr(mat, 'diffuse') and mat.diffuse:
-                material.base_color = [
-                    float(mat.diffuse[0]),
-                    float(mat.diffuse[1]),
-                    float(mat.diffuse[2])
-                ]
-            
-            # Specular -> metallic (heuristic conversion)
-            # High specular intensity suggests metallic surface
-            has_specular = False
-            spec_intensity = 0.0
-            if hasattr(mat, 'specular') and mat.specular:
-                spec_intensity = sum(mat.specular[:3]) / 3.0
-                has_specular = spec_intensity > 0.01  # Consider > 0.01 as having specular
-                
-                # Mirror materials (illum 5) should be highly metallic
-                if is_mirror:
-                    material.metallic = 1.0
-                    logger.debug(f"  Metallic: 1.0 (mirror material, illum=5)")
-                elif spec_intensity > 0.5:
-                    material.metallic = min(spec_intensity, 1.0)
-                    logger.debug(f"  Metallic (from specular): {material.metallic:.2f}")
-            
-            # Shininess -> roughness conversion
-            # If Ks = 0 (no specular), material is purely diffuse, set roughness = 1.0
-            if is_mirror:
-                # Mirror materials should have very low roughness
-                material.roughness = 0.0
-                logger.debug(f"  Roughness: 0.0 (mirror material, illum=5)")
-            elif not has_specular:
-                material.roughness = 1.0
-                logger.debug(f"  Roughness: 1.0 (purely diffuse, no specular)")
-            elif hasattr(mat, 'shininess') and mat.shininess > 0:
-                # Phong to PBR roughness: roughness = sqrt(2/(shininess+2))
-                material.roughness = (2.0 / (mat.shininess + 2.0)) ** 0.5
-                logger.debug(f"  Roughness (from shininess {mat.shininess}): {material.roughness:.2f}")
-            else:
-                material.roughness = 1.0  # Default to diffuse
-                logger.debug(f"  Roughness: 1.0 (default)")
-            
-            # Emission (Ke in MTL)
-            if hasattr(mat, 'emissive') and mat.emissive:
-                material.emission = [
-                    float(mat.emissive[0]),
-                    float(mat.emissive[1]),
-                    float(mat.emissive[2])
-                ]
-                emission_intensity = sum(material.emission) / 3.0
-                if emission_intensity > 0.01:
-                    logger.debug(f"  Emission: {material.emission} (intensity: {emission_intensity:.2f})")
-            
-            # Opacity/transparency
-            # Get Tf (transmission filter) color if available
-            tf_color = tf_values.get(mat_name, [1.0, 1.0, 1.0])
-            
-            # For glass materials (illum 7), we should enable transmission
-            if is_glass:
-                # Glass material - high transmission
-                material.opacity = 0.1  # Very transparent
-                transmission_strength = 0.9
-                material.transmission = TransmissionLayer(
-                    strength=transmission_strength,
-                    roughness=material.roughness,
-                    depth=0.0,
-                    color=tf_color,  # Use Tf color for transmission filter
-                    texture_index=-1
-                )
-                logger.debug(f"  Glass material: transmission={transmission_strength:.2f}, opacity={material.opacity:.2f}, Tf={tf_color}")
-            elif hasattr(mat, 'transparency'):
-                material.opacity = float(mat.transparency)
-                
-                # Add transmission layer for transparent materials
-                if material.opacity < 0.99:
-                    transmission_strength = 1.0 - material.opacity
-                    material.transmission = TransmissionLayer(
-                        strength=transmission_strength,
-                        roughness=material.roughness,
-                        depth=0.0,
-                        color=tf_color,  # Use Tf color for transmission filter
-                        texture_index=-1
-                    )
-                    logger.debug(f"  Transmission layer added (strength: {transmission_strength:.2f}, Tf={tf_color})")
-            
-            # IOR (optical density)
-            if hasattr(mat, 'optical_density') and mat.optical_density > 1.0:
-                material.ior = float(mat.optical_density)
-                logger.debug(f"  IOR: {material.ior:.2f}")
+            material = self._phong_to_pbr(mat_name, mat, tf_values)
             
             # Textures
             if hasattr(mat, 'texture') and mat.texture:
@@ -321,6 +497,116 @@ class WavefrontLoader(BaseLoader):
         
         return materials, texture_paths
     
+    def _phong_to_pbr(self, mat_name: str, mat, tf_values: dict) -> Material:
+        """Convert Phong/Blinn MTL parameters of one material to PBR"""
+        material = Material(name=mat_name)
+        
+        # Check illumination model for special handling
+        illum = getattr(mat, 'illumination_model', 2)
+        is_mirror = (illum == 5)  # Perfect mirror
+        is_glass = (illum == 7)   # Glass (refraction + reflection)
+        
+        logger.debug(f"  illum mode: {illum} (mirror={is_mirror}, glass={is_glass})")
+        
+        # Diffuse color -> base color
+        # For mirror materials, prefer specular color as base_color
+        if is_mirror and hasattr(mat, 'specular') and mat.specular:
+            material.base_color = [
+                float(mat.specular[0]),
+                float(mat.specular[1]),
+                float(mat.specular[2])
+            ]
+            logger.debug(f"  Using specular as base_color for mirror: {material.base_color}")
+        elif hasattr(mat, 'diffuse') and mat.diffuse:
+            material.base_color = [
+                float(mat.diffuse[0]),
+                float(mat.diffuse[1]),
+                float(mat.diffuse[2])
+            ]
+        
+        # Specular -> metallic (heuristic conversion)
+        # High specular intensity suggests metallic surface
+        has_specular = False
+        spec_intensity = 0.0
+        if hasattr(mat, 'specular') and mat.specular:
+            spec_intensity = sum(mat.specular[:3]) / 3.0
+            has_specular = spec_intensity > 0.01  # Consider > 0.01 as having specular
+            
+            # Mirror materials (illum 5) should be highly metallic
+            if is_mirror:
+                material.metallic = 1.0
+                logger.debug(f"  Metallic: 1.0 (mirror material, illum=5)")
+            elif spec_intensity > 0.5:
+                material.metallic = min(spec_intensity, 1.0)
+                logger.debug(f"  Metallic (from specular): {material.metallic:.2f}")
+        
+        # Shininess -> roughness conversion
+        # If Ks = 0 (no specular), material is purely diffuse, set roughness = 1.0
+        if is_mirror:
+            # Mirror materials should have very low roughness
+            material.roughness = 0.0
+            logger.debug(f"  Roughness: 0.0 (mirror material, illum=5)")
+        elif not has_specular:
+            material.roughness = 1.0
+            logger.debug(f"  Roughness: 1.0 (purely diffuse, no specular)")
+        elif hasattr(mat, 'shininess') and mat.shininess > 0:
+            # Phong to PBR roughness: roughness = sqrt(2/(shininess+2))
+            material.roughness = (2.0 / (mat.shininess + 2.0)) ** 0.5
+            logger.debug(f"  Roughness (from shininess {mat.shininess}): {material.roughness:.2f}")
+        else:
+            material.roughness = 1.0  # Default to diffuse
+            logger.debug(f"  Roughness: 1.0 (default)")
+        
+        # Emission (Ke in MTL)
+        if hasattr(mat, 'emissive') and mat.emissive:
+            material.emission = [
+                float(mat.emissive[0]),
+                float(mat.emissive[1]),
+                float(mat.emissive[2])
+            ]
+            emission_intensity = sum(material.emission) / 3.0
+            if emission_intensity > 0.01:
+                logger.debug(f"  Emission: {material.emission} (intensity: {emission_intensity:.2f})")
+        
+        # Opacity/transparency
+        # Get Tf (transmission filter) color if available
+        tf_color = tuple(tf_values.get(mat_name, (1.0, 1.0, 1.0)))
+        
+        # For glass materials (illum 7), we should enable transmission
+        if is_glass:
+            # Glass material - high transmission
+            material.opacity = 0.1  # Very transparent
+            transmission_strength = 0.9
+            material.transmission = TransmissionLayer(
+                strength=transmission_strength,
+                roughness=material.roughness,
+                depth=0.0,
+                color=tf_color,  # Use Tf color for transmission filter
+                texture_index=-1
+            )
+            logger.debug(f"  Glass material: transmission={transmission_strength:.2f}, opacity={material.opacity:.2f}, Tf={tf_color}")
+        elif hasattr(mat, 'transparency'):
+            material.opacity = float(mat.transparency)
+            
+            # Add transmission layer for transparent materials
+            if material.opacity < 0.99:
+                transmission_strength = 1.0 - material.opacity
+                material.transmission = TransmissionLayer(
+                    strength=transmission_strength,
+                    roughness=material.roughness,
+                    depth=0.0,
+                    color=tf_color,  # Use Tf color for transmission filter
+                    texture_index=-1
+                )
+                logger.debug(f"  Transmission layer added (strength: {transmission_strength:.2f}, Tf={tf_color})")
+        
+        # IOR (optical density)
+        if hasattr(mat, 'optical_density') and mat.optical_density > 1.0:
+            material.ior = float(mat.optical_density)
+            logger.debug(f"  IOR: {material.ior:.2f}")
+        
+        return material
+    
     def _resolve_texture_path(self, texture) -> str:
         """Resolve texture path relative to OBJ file directory"""
         # Extract texture filename
@@ -331,15 +617,11 @@ class WavefrontLoader(BaseLoader):
         else:
             tex_filename = str(texture)
         
-        # Resolve relative to OBJ directory
-        obj_dir = self.filepath.parent
-        tex_path = obj_dir / tex_filename
-        
-        if tex_path.exists():
-            return str(tex_path.resolve())
-        else:
-            logger.warning(f"Texture not found: {tex_path}")
-            return ""
+        # Resolve relative to OBJ directory; remember the candidate (found or not)
+        # so the scene cache can tell when textures appear, vanish or change
+        obj_dir = str(self.filepath.parent)
+        self._texture_references.add(os.path.abspath(os.path.join(obj_dir, tex_filename)))
+        return _resolve_texture_file(obj_dir, tex_filename)
     
     def _extract_meshes(
         self,
@@ -351,15 +633,16 @@ class WavefrontLoader(BaseLoader):
         material_map = {mat.name: idx for idx, mat in enumerate(materials)}
         
         for mesh_name, mesh_mat in wavefront_scene.materials.items():
-            if not hasattr(mesh_mat, 'vertices') or not mesh_mat.vertices:
+            # vertices is a list when parsed, a float32 array when loaded from cache
+            if not hasattr(mesh_mat, 'vertices') or len(mesh_mat.vertices) == 0:
                 continue
             
             logger.debug(f"Processing mesh: {mesh_name}")
             
-            # Determine vertex stride
+            # Parse the vertex layout and stride once per mesh
             vertex_format = mesh_mat.vertex_format
             # Format example: "V3F N3F T2F" means 3+3+2=8 floats per vertex
-            stride = self._calculate_stride(vertex_format)
+            layout, stride = self._parse_vertex_layout(vertex_format)
             
             # Extract vertices
             vertices_flat = mesh_mat.vertices
@@ -369,148 +652,77 @@ class WavefrontLoader(BaseLoader):
                 logger.warning(f"Mesh {mesh_name} has no vertices, skipping")
                 continue
             
-            vertices = []
-            for i in range(num_vertices):
-                base_idx = i * stride
-                vertex = self._extract_vertex(vertices_flat, base_idx, stride, vertex_format)
-                vertices.append(vertex)
-            
-            # Generate indices (assuming already triangulated)
-            indices = list(range(num_vertices))
-            
-            # Check if normals need to be computed
-            needs_normal_computation = 'N' not in vertex_format.upper()
-            if needs_normal_computation:
-                logger.debug(f"  Computing normals for {mesh_name} (format: {vertex_format})")
-                vertices = self._compute_normals(vertices, indices)
+            # Deinterleave with strided column views instead of a per-vertex loop
+            vertex_data = np.asarray(vertices_flat, dtype=np.float32)
+            vertex_data = vertex_data[:num_vertices * stride].reshape(num_vertices, stride)
+            positions, normals, texcoords, tangents = self._deinterleave_vertices(
+                vertex_data, layout
+            )
             
-            # Create mesh
+            # Create mesh (indices: assuming already triangulated)
             mesh = Mesh(
                 name=mesh_name,
-                vertices=vertices,
-                indices=indices,
+                positions=positions,
+                normals=normals,
+                texcoords=texcoords,
+                tangents=tangents,
+                indices=np.arange(num_vertices, dtype=np.uint32),
                 material_index=material_map.get(mesh_name, 0)
             )
             
+            # Check if normals need to be computed (batched over all triangles)
+            needs_normal_computation = 'N' not in vertex_format.upper()
+            if needs_normal_computation:
+                logger.debug(f"  Computing normals for {mesh_name} (format: {vertex_format})")
+                mesh.recompute_normals()
+            
             meshes.append(mesh)
             logger.debug(f"  Vertices: {num_vertices}, Material: {mesh.material_index}")
         
         return meshes
     
-    def _calculate_stride(self, vertex_format: str) -> int:
-        """Calculate vertex stride from format string (e.g., 'V3F_N3F_T2F' or 'V3F N3F T2F' -> 8)"""
-        # Parse format like "V3F N3F T2F" or "V3F_N3F_T2F"
+    def _parse_vertex_layout(self, vertex_format: str) -> Tuple[Dict[str, Tuple[int, int]], int]:
+        """
+        Parse vertex format once into {component: (offset, size)} for the
+        position (V), normal (N) and texcoord (T) components, plus the stride
+        (e.g., 'V3F_N3F_T2F' or 'V3F N3F T2F' -> 8).
+        Common formats: "T2F_N3F_V3F", "N3F_V3F", "V3F_N3F_T2F"
+        """
+        layout = {}
+        offset = 0
         # Split by both space and underscore
-        tokens = vertex_format.replace('_', ' ').split()
-        stride = 0
-        for token in tokens:
-            # Extract number (e.g., "V3F" -> 3)
-            num_str = ''.join(c for c in token if c.isdigit())
-            if num_str:
-                stride += int(num_str)
-        
-        # Default to 8 if parsing fails (V3F N3F T2F)
-        return stride if stride > 0 else 8
+        for comp in vertex_format.replace('_', ' ').split():
+            match = _DIGITS_RE.search(comp)
+            if not match:
+                continue
+            size = int(match.group())
+            kind = comp[0].upper()
+            # Color (C) and unknown components are skipped
+            if kind in ('V', 'N', 'T'):
+                layout[kind] = (offset, size)
+            offset += size
+        
+        # Default stride to 8 if parsing fails (V3F N3F T2F)
+        return layout, (offset if offset > 0 else 8)
     
-    def _extract_vertex(
+    def _deinterleave_vertices(
         self,
-        vertices_flat: List[float],
-        base_idx: int,
-        stride: int,
-        vertex_format: str
-    ) -> Vertex:
-        """Extract single vertex from flat vertex array based on format"""
-        # Parse vertex format to determine component order
-        # Common formats: "T2F_N3F_V3F", "N3F_V3F", "V3F_N3F_T2F"
-        components = vertex_format.replace('_', ' ').split()
-        
-        position = [0.0, 0.0, 0.0]
-        normal = [0.0, 0.0, 1.0]
-        texcoord = [0.0, 0.0]
-        
-        offset = 0
-        for comp in components:
-            comp_upper = comp.upper()
-            
-            if comp_upper.startswith('V'):
-                # Position (Vertex)
-                size = int(''.join(c for c in comp if c.isdigit()))
-                position = [float(vertices_flat[base_idx + offset + i]) for i in range(size)]
-                if size == 2:
-                    position.append(0.0)  # Add z=0 for 2D positions
-                offset += size
-                
-            elif comp_upper.startswith('N'):
-                # Normal
-                size = int(''.join(c for c in comp if c.isdigit()))
-                normal = [float(vertices_flat[base_idx + offset + i]) for i in range(size)]
-                offset += size
-                
-            elif comp_upper.startswith('T') or comp_upper.startswith('C'):
-                # TexCoord (T) or Color (C)
-                size = int(''.join(c for c in comp if c.isdigit()))
-                if comp_upper.startswith('T'):
-                    texcoord = [float(vertices_flat[base_idx + offset + i]) for i in range(size)]
-                offset += size
-                
-            else:
-                # Unknown component, try to extract size and skip
-                num_str = ''.join(c for c in comp if c.isdigit())
-                if num_str:
-                    offset += int(num_str)
-        
+        vertex_data: np.ndarray,
+        layout: Dict[str, Tuple[int, int]]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Split interleaved (N, stride) vertex rows into SoA attribute arrays"""
+        num_vertices = len(vertex_data)
+        positions = np.zeros((num_vertices, 3), dtype=np.float32)
+        normals = np.tile(np.array([0.0, 0.0, 1.0], dtype=np.float32), (num_vertices, 1))
+        texcoords = np.zeros((num_vertices, 2), dtype=np.float32)
         # Tangent (not provided by OBJ, use default)
-        tangent = [1.0, 0.0, 0.0]
+        tangents = np.tile(np.array([1.0, 0.0, 0.0], dtype=np.float32), (num_vertices, 1))
         
-        return Vertex(
-            position=position,
-            normal=normal,
-            texcoord=texcoord,
-            tangent=tangent
-        )
-    
-    def _compute_normals(self, vertices: List[Vertex], indices: List[int]) -> List[Vertex]:
-        """Compute normals from triangle geometry for vertices without normals"""
-        import numpy as np
-        
-        # Initialize accumulated normals
-        num_verts = len(vertices)
-        accumulated_normals = [np.array([0.0, 0.0, 0.0]) for _ in range(num_verts)]
-        
-        # Compute face normals and accumulate to vertices
-        num_triangles = len(indices) // 3
-        for i in range(num_triangles):
-            i0, i1, i2 = indices[i*3], indices[i*3+1], indices[i*3+2]
-            
-            v0 = np.array(vertices[i0].position)
-            v1 = np.array(vertices[i1].position)
-            v2 = np.array(vertices[i2].position)
-            
-            # Compute face normal
-            edge1 = v1 - v0
-            edge2 = v2 - v0
-            face_normal = np.cross(edge1, edge2)
-            
-            # Accumulate to vertices
-            accumulated_normals[i0] += face_normal
-            accumulated_normals[i1] += face_normal
-            accumulated_normals[i2] += face_normal
-        
-        # Normalize and update vertices
-        new_vertices = []
-        for i, vertex in enumerate(vertices):
-            normal = accumulated_normals[i]
-            norm = np.linalg.norm(normal)
-            if norm > 1e-6:
-                normal = normal / norm
-            else:
-                normal = np.array([0.0, 0.0, 1.0])
-            
-            new_vertices.append(Vertex(
-                position=vertex.position,
-                normal=normal.tolist(),
-                texcoord=vertex.texcoord,
-                tangent=vertex.tangent
-            ))
-        
-        return new_vertices
+        # 2D positions keep z=0
+        for kind, target in (('V', positions), ('N', normals), ('T', texcoords)):
+            if kind in layout:
+                offset, size = layout[kind]
+                size = min(size, target.shape[1])
+                target[:, :size] = vertex_data[:, offset:offset + size]
+        
+        return positions, normals, texcoords, tangents
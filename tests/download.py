@@ -1,14 +1,27 @@
 # Download test scenes from https://casual-effects.com/data/
 import os
+import shutil
 import urllib.request
 import urllib.error
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+try:
+    import requests
+except ImportError:
+    requests = None
+
+# Copy buffer for streaming the response body to disk
+COPY_BUFFER_SIZE = 1024 * 1024
+# Concurrent connections to the archive server
+MAX_PARALLEL_DOWNLOADS = 4
+
 def download_file(url, dest_folder, retries=3, sleep_between=2):
     """Download a file with custom headers to avoid HTTP 406.
 
-    Adds a browser-like User-Agent and Accept headers. Falls back to requests if available.
+    Adds a browser-like User-Agent and Accept headers. Streams the body with
+    requests if available (pooled connections), otherwise with urllib.
     """
     dest = Path(dest_folder)
     dest.mkdir(parents=True, exist_ok=True)
@@ -27,43 +40,36 @@ def download_file(url, dest_folder, retries=3, sleep_between=2):
         "Accept-Encoding": "identity",
     }
 
-    for attempt in range(1, retries + 1):
-        try:
-            req = urllib.request.Request(url, headers=headers)
-            with urllib.request.urlopen(req, timeout=60) as resp, open(filename, "wb") as f:
-                # Stream in chunks
-                chunk_size = 1024 * 64
-                total = 0
-                while True:
-                    chunk = resp.read(chunk_size)
-                    if not chunk:
-                        break
-                    f.write(chunk)
-                    total += len(chunk)
-                print(f"Downloaded {total/1024/1024:.2f} MB -> {filename}")
-            return filename
-        except urllib.error.HTTPError as e:
-            if e.code == 406:
-                print(f"HTTP 406 Not Acceptable (attempt {attempt}/{retries}). Retrying with fallback...")
-                # Try requests fallback if installed
-                try:
-                    import requests
-                    r = requests.get(url, headers=headers, timeout=60)
-                    if r.status_code == 200:
+    session = requests.Session() if requests is not None else None
+    try:
+        for attempt in range(1, retries + 1):
+            try:
+                if session is not None:
+                    with session.get(url, headers=headers, stream=True, timeout=60) as r:
+                        r.raise_for_status()
+                        r.raw.decode_content = True
                         with open(filename, "wb") as f:
-                            f.write(r.content)
-                        print(f"Downloaded via requests fallback -> {filename}")
-                        return filename
-                    else:
-                        print(f"Requests fallback status {r.status_code}")
-                except ImportError:
-                    print("'requests' not installed; skipping fallback.")
-            else:
-                print(f"HTTP error {e.code}: {e.reason} (attempt {attempt}/{retries})")
-        except Exception as ex:
-            print(f"Error: {ex} (attempt {attempt}/{retries})")
-        if attempt < retries:
-            time.sleep(sleep_between)
+                            shutil.copyfileobj(r.raw, f, COPY_BUFFER_SIZE)
+                            total = f.tell()
+                else:
+                    req = urllib.request.Request(url, headers=headers)
+                    with urllib.request.urlopen(req, timeout=60) as resp, open(filename, "wb") as f:
+                        shutil.copyfileobj(resp, f, COPY_BUFFER_SIZE)
+                        total = f.tell()
+                print(f"Downloaded {total/1024/1024:.2f} MB -> {filename}")
+                return filename
+            except urllib.error.HTTPError as e:
+                if e.code == 406:
+                    print(f"HTTP 406 Not Acceptable (attempt {attempt}/{retries}). Retrying...")
+                else:
+                    print(f"HTTP error {e.code}: {e.reason} (attempt {attempt}/{retries})")
+            except Exception as ex:
+                print(f"Error: {ex} (attempt {attempt}/{retries})")
+            if attempt < retries:
+                time.sleep(sleep_between)
+    finally:
+        if session is not None:
+            session.close()
 
     raise RuntimeError(f"Failed to download {url} after {retries} attempts.")
 
@@ -74,6 +80,17 @@ def unzip_file(zip_path, extract_to):
         zip_ref.extractall(extract_to)
     print("Unzip completed.")
 
+def process_url(url, dest_folder, extract_path):
+    """Download, unzip and remove one archive; returns False on failure."""
+    try:
+        zip_path = download_file(url, dest_folder)
+        unzip_file(str(zip_path), extract_path)
+        os.remove(zip_path)
+        return True
+    except Exception as e:
+        print(f"Failed to process {url}: {e}")
+        return False
+
 if __name__ == "__main__":
     # Casual Effects archive sometimes rejects plain python user agents.
     urls = [
@@ -108,12 +125,16 @@ if __name__ == "__main__":
         Path(dest_folder) / "bistro" / "BuildingTextures",
         Path(dest_folder) / "bistro" / "OtherTextures"
     ]
-    for url, extract_path in zip(urls, extract_paths):
-        try:
-            zip_path = download_file(url, dest_folder)
-            unzip_file(str(zip_path), extract_path)
-            os.remove(zip_path)
-        except Exception as e:
-            print(f"Failed to process {url}: {e}")
+    # Downloads are network-bound, so fetch them concurrently; each task
+    # handles its own errors so one failure doesn't cancel the others
+    tasks = list(zip(urls, extract_paths))
+    with ThreadPoolExecutor(max_workers=min(len(tasks), MAX_PARALLEL_DOWNLOADS)) as executor:
+        futures = {
+            executor.submit(process_url, url, dest_folder, extract_path): url
+            for url, extract_path in tasks
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            status = "ok" if future.result() else "failed"
+            print(f"[{done}/{len(tasks)}] {futures[future]}: {status}")
 
     print("All downloads attempted.")
\ No newline at end of file
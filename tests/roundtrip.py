@@ -0,0 +1,89 @@
+# Round-trip check for the .acg exporter/importer: export a synthetic scene in
+# format v1 (float vertices) and v2 (octahedral int16 normals/tangents), load it
+# back and compare. Run from the repository root: python tests/roundtrip.py
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'loader'))
+
+from binary_exporter import BinarySceneExporter, BinarySceneImporter
+from data_structures import SceneData, Mesh, Material, TransmissionLayer
+
+# Octahedral int16 quantization error budget for unit vectors, in degrees
+MAX_ANGLE_ERROR_DEG = 0.05
+
+def make_scene(vertex_count=4096, seed=0):
+    rng = np.random.default_rng(seed)
+
+    def unit_vectors(n):
+        v = rng.normal(size=(n, 3))
+        return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+    # Canonical axes first so the octahedron's corners/edges are covered
+    axes = np.array([[1, 0, 0], [-1, 0, 0], [0, 1, 0], [0, -1, 0], [0, 0, 1], [0, 0, -1]], dtype=np.float64)
+    normals = np.vstack((axes, unit_vectors(vertex_count - len(axes))))
+    # Half the tangents are zero, as produced by loaders without tangent data
+    tangents = unit_vectors(vertex_count)
+    tangents[::2] = 0.0
+
+    mesh = Mesh(
+        name="roundtrip",
+        positions=rng.uniform(-10.0, 10.0, size=(vertex_count, 3)),
+        normals=normals,
+        texcoords=rng.uniform(0.0, 1.0, size=(vertex_count, 2)),
+        tangents=tangents,
+        indices=rng.integers(0, vertex_count, size=vertex_count * 3),
+    )
+    glass = Material(name="glass", transmission=TransmissionLayer(strength=0.9))
+    scene = SceneData(materials=[Material(name="plain"), glass], textures=["a.png"])
+    scene.add_mesh(mesh)
+    return scene
+
+def max_angle_deg(a, b):
+    cos = np.clip(np.einsum('ij,ij->i', a, b), -1.0, 1.0)
+    return float(np.degrees(np.arccos(cos)).max()) if len(cos) else 0.0
+
+def check(scene, quantize, path):
+    BinarySceneExporter(quantize_vectors=quantize).export(scene, path)
+    loaded = BinarySceneImporter().load(path)
+    src, dst = scene.meshes[0], loaded.meshes[0]
+    errors = []
+
+    if [m.name for m in loaded.materials] != [m.name for m in scene.materials]:
+        errors.append("material names differ")
+    if not np.array_equal(src.indices, dst.indices):
+        errors.append("indices differ")
+    if not (np.array_equal(src.positions, dst.positions) and np.array_equal(src.texcoords, dst.texcoords)):
+        errors.append("positions/texcoords differ")
+
+    if not quantize:
+        if not (np.array_equal(src.normals, dst.normals) and np.array_equal(src.tangents, dst.tangents)):
+            errors.append("normals/tangents differ")
+        return errors, 0.0
+
+    has_tangent = np.any(src.tangents != 0.0, axis=1)
+    if np.any(dst.tangents[~has_tangent] != 0.0):
+        errors.append("zero tangents did not decode to zero")
+    angle = max(max_angle_deg(src.normals, dst.normals),
+                max_angle_deg(src.tangents[has_tangent], dst.tangents[has_tangent]))
+    if angle > MAX_ANGLE_ERROR_DEG:
+        errors.append(f"angular error {angle:.4f} deg exceeds {MAX_ANGLE_ERROR_DEG} deg")
+    return errors, angle
+
+if __name__ == "__main__":
+    scene = make_scene()
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        for quantize in (False, True):
+            errors, angle = check(scene, quantize, os.path.join(tmp, "roundtrip.acg"))
+            version = 2 if quantize else 1
+            if errors:
+                failed = True
+                print(f"v{version}: FAILED - " + "; ".join(errors))
+            else:
+                print(f"v{version}: ok (max angular error {angle:.4f} deg)")
+
+    sys.exit(1 if failed else 0)
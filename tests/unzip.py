@@ -1,14 +1,40 @@
 # Unzip all zip files "xxx.zip" in the current directory to folders "scenes/xxx" with the same name
 import zipfile
 import os
+from concurrent.futures import ProcessPoolExecutor
 
-for item in os.listdir('.'):
-    if item.endswith('.zip'):
-        file_name = os.path.abspath(item)
-        folder_name = os.path.join('scenes')
+def extract_one(file_name, folder_name='scenes'):
+    # Runs in a worker process: DEFLATE decompression is CPU-bound, so
+    # separate archives are extracted on separate cores
+    with zipfile.ZipFile(file_name, 'r') as zip_ref:
+        zip_ref.extractall(folder_name)
+    return file_name
+
+def create_directories(zip_files, folder_name='scenes'):
+    # zipfile creates missing parent directories with os.makedirs but no
+    # exist_ok, so two workers extracting archives that share folders can race
+    # with FileExistsError. Create the whole directory tree up front instead.
+    directories = set()
+    for file_name in zip_files:
         with zipfile.ZipFile(file_name, 'r') as zip_ref:
-            zip_ref.extractall(folder_name)
+            for name in zip_ref.namelist():
+                parent = name if name.endswith('/') else os.path.dirname(name)
+                parts = parent.replace('\\', '/').split('/')
+                # Leave absolute/'..' member paths to zipfile's own sanitizing
+                if not parent or os.path.isabs(parent) or '..' in parts or ':' in parts[0]:
+                    continue
+                directories.add(os.path.normpath(parent))
+    for directory in sorted(directories):
+        os.makedirs(os.path.join(folder_name, directory), exist_ok=True)
+
+if __name__ == '__main__':
+    zip_files = [os.path.abspath(item) for item in os.listdir('.') if item.endswith('.zip')]
+    folder_name = os.path.join('scenes')
 
-        print(f'Extracted {file_name} to {folder_name}')
+    if zip_files:
+        create_directories(zip_files, folder_name)
+        with ProcessPoolExecutor(max_workers=min(len(zip_files), os.cpu_count() or 1)) as executor:
+            for file_name in executor.map(extract_one, zip_files):
+                print(f'Extracted {file_name} to {folder_name}')
 
-print('All zip files have been extracted.')
\ No newline at end of file
+    print('All zip files have been extracted.')